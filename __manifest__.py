@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 'Custom Maintenance',
-    'version': '18.0.1.0',
+    'version': '18.0.1.3',
     'sequence': 0,
     'summary': 'Manage custom maintenance requests',
     'description': """
@@ -15,7 +15,10 @@
     'data': [
         'security/maintenance_security.xml',
         'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
+        'data/maintenance_equipment_data.xml',
         'views/maintenance_request_custom_views.xml',
+        'views/maintenance_request_custom_kpi_views.xml',
         'views/maintenance_equipment.xml',
         'views/maintenance_equipment_category.xml',
         'views/menu_equipment_catalog_view.xml',
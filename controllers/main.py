@@ -0,0 +1,47 @@
+from werkzeug.exceptions import BadRequest, NotFound
+
+from odoo import http
+from odoo.http import request
+from odoo.tools import str2bool
+
+from odoo.addons.maintenance_request_custom.models.ir_attachment import PREVIEW_SIZES
+
+
+class EquipmentCatalogueController(http.Controller):
+
+    def _get_catalogue_attachment(self, catalogue_id, attachment_id):
+        catalogue = request.env['equipment.catalogue'].browse(catalogue_id).exists()
+        if not catalogue:
+            raise NotFound()
+        catalogue.check_access('read')
+        if attachment_id not in catalogue.sudo().attachment_ids.ids:
+            raise NotFound()
+        return request.env['ir.attachment'].sudo().browse(attachment_id)
+
+    @http.route('/maintenance/catalogue/<int:catalogue_id>/attachment/<int:attachment_id>',
+                type='http', auth='user', readonly=True)
+    def catalogue_attachment(self, catalogue_id, attachment_id, download=False):
+        """ Stream a catalogue file from the filestore, answering Range and
+        If-None-Match requests without loading the whole file """
+        attachment = self._get_catalogue_attachment(catalogue_id, attachment_id)
+        stream = request.env['ir.binary']._get_stream_from(attachment)
+        return stream.get_response(as_attachment=str2bool(download))
+
+    @http.route('/maintenance/catalogue/<int:catalogue_id>/attachment/<int:attachment_id>/preview',
+                type='http', auth='user')
+    def catalogue_attachment_preview(self, catalogue_id, attachment_id, size=256):
+        """ PNG preview of a catalogue image or of the first page of a PDF, in the
+        smallest available size at least as large as the requested one """
+        try:
+            size = int(size)
+        except ValueError:
+            raise BadRequest()
+        size = next((preview_size for preview_size in PREVIEW_SIZES if preview_size >= size), PREVIEW_SIZES[-1])
+        attachment = self._get_catalogue_attachment(catalogue_id, attachment_id)
+        preview = attachment._get_catalogue_preview(size)
+        if not preview:
+            raise NotFound()
+
+        stream = request.env['ir.binary']._get_stream_from(preview)
+        stream.max_age = 86400
+        return stream.get_response()
@@ -0,0 +1,17 @@
+def migrate(cr, version):
+    # Link existing checklist copies to the equipment instruction they were
+    # copied from, previously only matched by name
+    cr.execute("""
+        UPDATE maintenance_instructions_custom mic
+           SET template_id = tmpl.id
+          FROM (
+                SELECT DISTINCT ON (mic.id) mic.id AS copy_id, tmpl.id
+                  FROM maintenance_instructions_custom mic
+                  JOIN maintenance_request_custom req ON req.id = mic.request_id
+                  JOIN maintenance_instructions tmpl ON tmpl.equipment_id = req.equipment_id
+                                                    AND tmpl.name = mic.name
+                 WHERE mic.template_id IS NULL
+              ORDER BY mic.id, tmpl.id
+          ) tmpl
+         WHERE mic.id = tmpl.copy_id
+    """)
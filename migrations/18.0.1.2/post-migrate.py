@@ -0,0 +1,48 @@
+from odoo.tools.sql import column_exists
+
+BATCH_SIZE = 1000
+
+
+def migrate(cr, version):
+    # Files of the former image/attachment binary fields become regular
+    # catalogue attachments, named after their file name when known
+    if column_exists(cr, 'equipment_catalogue', 'attachment_filename'):
+        file_name = "COALESCE(NULLIF(catalogue.attachment_filename, ''), attachment.name)"
+    else:
+        file_name = "attachment.name"
+    while True:
+        cr.execute("""
+            SELECT id
+              FROM ir_attachment
+             WHERE res_model = 'equipment.catalogue'
+               AND res_field IN ('image', 'attachment')
+             LIMIT %s
+        """, [BATCH_SIZE])
+        attachment_ids = [row[0] for row in cr.fetchall()]
+        if not attachment_ids:
+            break
+        cr.execute(f"""
+            UPDATE ir_attachment attachment
+               SET res_field = NULL,
+                   name = {file_name}
+              FROM equipment_catalogue catalogue
+             WHERE catalogue.id = attachment.res_id
+               AND attachment.id = ANY(%s)
+        """, [attachment_ids])
+        # Attachments of deleted catalogues
+        cr.execute("""
+            UPDATE ir_attachment
+               SET res_field = NULL
+             WHERE id = ANY(%s)
+               AND res_field IS NOT NULL
+        """, [attachment_ids])
+
+    cr.execute("""
+        INSERT INTO equipment_catalogue_attachment_rel (catalogue_id, attachment_id)
+             SELECT catalogue.id, attachment.id
+               FROM ir_attachment attachment
+               JOIN equipment_catalogue catalogue ON catalogue.id = attachment.res_id
+              WHERE attachment.res_model = 'equipment.catalogue'
+                AND attachment.res_field IS NULL
+        ON CONFLICT DO NOTHING
+    """)
@@ -0,0 +1,22 @@
+from odoo.tools.sql import column_exists
+
+
+def migrate(cr, version):
+    # Cancelled requests used the archive flag, they are now inactive
+    if column_exists(cr, 'maintenance_request_custom', 'archive'):
+        cr.execute("""
+            UPDATE maintenance_request_custom
+               SET active = false
+             WHERE archive
+        """)
+        cr.execute("ALTER TABLE maintenance_request_custom DROP COLUMN archive")
+    # The partial indexes now follow the active flag
+    cr.execute("DROP INDEX IF EXISTS maintenance_request_custom_open_equipment_idx")
+    cr.execute("DROP INDEX IF EXISTS maintenance_request_custom_open_department_idx")
+    # Cancelled requests are left out of the KPIs
+    cr.execute("""
+        UPDATE maintenance_request_custom_kpi kpi
+           SET active = req.active OR req.history_date IS NOT NULL
+          FROM maintenance_request_custom req
+         WHERE req.id = kpi.id
+    """)
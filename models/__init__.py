@@ -1,5 +1,14 @@
+from . import maintenance_fulltext_mixin
+from . import maintenance_instructions_mixin
 from . import maintenance_equipment
 from . import maintenance_request_custom
+from . import maintenance_request_archive
 from . import maintenance_request
 from . import maintenance_equipment_category
-from . import equipment_catalogs
\ No newline at end of file
+from . import maintenance_stage
+from . import maintenance_request_custom_kpi
+from . import maintenance_report_cache
+from . import ir_attachment
+from . import hr_employee
+from . import equipment_catalogs
+from . import mail_activity
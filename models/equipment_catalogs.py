@@ -1,24 +1,86 @@
-from odoo import models, fields
+from markupsafe import Markup
+
+from odoo import models, fields, api
+from odoo.tools import SQL
 
 
 class EquipmentCatalogue(models.Model):
     _name = 'equipment.catalogue'
     _description = 'Equipment Catalogue'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'maintenance.fulltext.mixin']
 
     name = fields.Char(
         string="Equipment Catalogue",
-        required=True
+        required=True,
+        index='trigram'
     )
 
-    attachment_ids = fields.One2many(
+    attachment_ids = fields.Many2many(
         'ir.attachment',
-        'res_id',
-        string="Attachments",
-        domain=lambda self: [
-            ('res_model', '=', self._name),
-            ('res_id', '=', self.id)
-        ],
-        auto_join=True
+        'equipment_catalogue_attachment_rel',
+        'catalogue_id',
+        'attachment_id',
+        string="Attachments"
     )
-    equipment_name = fields.Many2one('maintenance.equipment',string = "Equipment")
+    equipment_name = fields.Many2one('maintenance.equipment', string="Equipment", index='btree_not_null')
+    preview_url = fields.Char(string="Preview", compute='_compute_file_urls')
+    file_links = fields.Html(string="Files", compute='_compute_file_urls', sanitize=False)
+
+    @api.depends('attachment_ids')
+    def _compute_file_urls(self):
+        for catalogue in self:
+            url = f"/maintenance/catalogue/{catalogue.id}/attachment"
+            catalogue.preview_url = (
+                f"{url}/{catalogue.attachment_ids[0].id}/preview?size=256" if catalogue.attachment_ids else False
+            )
+            catalogue.file_links = Markup().join(
+                Markup(
+                    "<a class='d-inline-block m-2 text-center' href='%s/%s?download=1'>"
+                    "<img class='d-block mx-auto' src='%s/%s/preview?size=128' alt='' loading='lazy'/>%s</a>"
+                ) % (url, attachment.id, url, attachment.id, attachment.name)
+                for attachment in catalogue.attachment_ids
+            ) if catalogue.id else False
+
+    def init(self):
+        super().init()
+        if not self._has_attachment_text():
+            return
+        # Text extracted from the catalogue files (e.g. PDF manuals)
+        for config in self._get_fulltext_configs():
+            self.env.cr.execute(SQL(
+                """
+                CREATE INDEX IF NOT EXISTS %s ON ir_attachment USING gin ((%s))
+                 WHERE res_model = 'equipment.catalogue'
+                """,
+                SQL.identifier(f"ir_attachment_catalogue_fulltext_{config}_idx"),
+                self._fulltext_attachment_vector(config),
+            ))
+
+    @api.model
+    def _has_attachment_text(self):
+        """ Whether the text of the files is extracted by attachment_indexation,
+        index_content otherwise only holds their MIME major type """
+        return self.env['ir.module.module']._get('attachment_indexation').state == 'installed'
+
+    @api.model
+    def _fulltext_attachment_vector(self, config):
+        return SQL("to_tsvector(%s::regconfig, coalesce(index_content, ''))", config)
+
+    @api.model
+    def _fulltext_condition(self, query):
+        if not self._has_attachment_text():
+            return super()._fulltext_condition(query)
+        attachment_condition = SQL(" OR ").join(
+            SQL("%s @@ websearch_to_tsquery(%s::regconfig, %s)", self._fulltext_attachment_vector(config), config, query)
+            for config in self._get_fulltext_configs()
+        )
+        return SQL(
+            """(%s) OR id IN (
+                SELECT rel.catalogue_id
+                  FROM equipment_catalogue_attachment_rel rel
+                  JOIN ir_attachment ON ir_attachment.id = rel.attachment_id
+                 WHERE ir_attachment.res_model = 'equipment.catalogue' AND (%s)
+            )""",
+            super()._fulltext_condition(query),
+            attachment_condition,
+        )
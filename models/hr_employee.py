@@ -0,0 +1,26 @@
+from odoo import models, fields
+
+
+class HrEmployee(models.Model):
+    _inherit = 'hr.employee'
+
+    maintenance_digest_activity_id = fields.Many2one(
+        'mail.activity',
+        string="Maintenance Digest Activity",
+        copy=False,
+        ondelete='set null',
+        help="Open activity collecting the maintenance request notifications of the departments this employee manages."
+    )
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {'department_id', 'user_id', 'active', 'name'} & set(vals):
+            # Record rules restricting requests to the user's department are cached
+            # per user, and the members of maintenance teams per team
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
@@ -0,0 +1,85 @@
+import logging
+import subprocess
+
+from odoo import models, api
+from odoo.tools.image import image_process
+from odoo.tools.misc import find_in_path
+
+_logger = logging.getLogger(__name__)
+
+# Sizes, in pixels, of the catalogue previews
+PREVIEW_SIZES = (128, 256, 512)
+PREVIEW_MODEL = 'equipment.catalogue.preview'
+
+
+class IrAttachment(models.Model):
+    _inherit = 'ir.attachment'
+
+    @api.model
+    def _create_shared_copies(self, copies):
+        """ Create attachments holding the same content as existing ones; the
+        filestore keys files by checksum, so the copies reuse the stored file.
+
+        :param copies: list of (source attachment, values of the new attachment)
+        """
+        vals_list = []
+        for source, vals in copies:
+            vals_list.append(dict(
+                vals,
+                type='binary',
+                mimetype=vals.get('mimetype') or source.mimetype,
+                raw=source.raw,
+            ))
+        return self.sudo().create(vals_list)
+
+    def _get_catalogue_preview(self, size):
+        """ PNG preview of an image, or of the first page of a PDF when poppler's
+        pdftoppm is available. Previews are stored as attachments shared by every
+        file with the same content, one per size of PREVIEW_SIZES.
+
+        :return: the preview attachment, or an empty recordset when none can be made
+        """
+        self.ensure_one()
+        if size not in PREVIEW_SIZES or not self.checksum:
+            return self.browse()
+        name = f"catalogue_preview_{self.checksum}_{size}.png"
+        Attachment = self.sudo()
+        preview = Attachment.search([('res_model', '=', PREVIEW_MODEL), ('name', '=', name)], limit=1)
+        if preview:
+            return preview
+
+        content = self._render_catalogue_preview(size)
+        if not content:
+            return self.browse()
+        return Attachment.create({
+            'name': name,
+            'res_model': PREVIEW_MODEL,
+            'type': 'binary',
+            'mimetype': 'image/png',
+            'raw': content,
+        })
+
+    def _render_catalogue_preview(self, size):
+        attachment = self.sudo()
+        mimetype = attachment.mimetype or ''
+        if mimetype.startswith('image/'):
+            return image_process(attachment.raw, size=(size, size), output_format='PNG')
+        if mimetype != 'application/pdf':
+            return None
+
+        try:
+            pdftoppm = find_in_path('pdftoppm')
+        except OSError:
+            return None
+        if attachment.store_fname:
+            source, pdf_input = attachment._full_path(attachment.store_fname), None
+        else:
+            source, pdf_input = '-', attachment.raw
+        try:
+            return subprocess.run(
+                [pdftoppm, '-png', '-f', '1', '-l', '1', '-singlefile', '-scale-to', str(size), source, '-'],
+                input=pdf_input, capture_output=True, check=True, timeout=60,
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            _logger.warning("Could not render the preview of attachment %s", attachment.id, exc_info=True)
+            return None
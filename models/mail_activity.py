@@ -0,0 +1,12 @@
+from odoo import models
+from odoo.tools.sql import create_index
+
+
+class MailActivity(models.Model):
+    _inherit = 'mail.activity'
+
+    def init(self):
+        super().init()
+        # activity_update looks up the to-do of each request by document and type
+        create_index(self.env.cr, 'mail_activity_res_model_id_res_id_type_idx', self._table,
+                     ['res_model_id', 'res_id', 'activity_type_id'])
@@ -1,5 +1,11 @@
+import logging
+
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from odoo.tools import split_every, str2bool
+from odoo.tools.sql import index_exists
+
+_logger = logging.getLogger(__name__)
 
 
 class MaintenanceEquipment(models.Model):
@@ -13,35 +19,102 @@ class MaintenanceEquipment(models.Model):
         string="Maintenance Instructions"
     )
     item_code = fields.Char(string="Equipment Code", copy=False, readonly=True, index=True)
+    catalogue_ids = fields.One2many('equipment.catalogue', 'equipment_name', string="Catalogues")
+    custom_request_ids = fields.One2many('maintenance.request.custom', 'equipment_id', string="Employee Requests")
+    open_custom_request_count = fields.Integer(string="Open Employee Requests",
+                                               compute='_compute_open_custom_request_count',
+                                               store=True,
+                                               index=True)
+
+    @api.depends('custom_request_ids.stage_id.done', 'custom_request_ids.active')
+    def _compute_open_custom_request_count(self):
+        open_counts = dict(self.env['maintenance.request.custom']._read_group(
+            [('equipment_id', 'in', self.ids), ('stage_id.done', '=', False)],
+            ['equipment_id'],
+            ['__count'],
+        ))
+        for equipment in self:
+            equipment.open_custom_request_count = open_counts.get(equipment, 0)
+
+    def init(self):
+        super().init()
+        self._create_item_code_index()
+
+    @api.model
+    def _create_item_code_index(self):
+        """ Enforce unique equipment codes, once existing duplicates have been renumbered """
+        if index_exists(self.env.cr, 'maintenance_equipment_item_code_unique'):
+            return
+        self.env.cr.execute("""
+            SELECT item_code
+              FROM maintenance_equipment
+             WHERE item_code IS NOT NULL AND item_code != ''
+          GROUP BY item_code
+            HAVING count(*) > 1
+             LIMIT 1
+        """)
+        if self.env.cr.fetchone():
+            _logger.warning("Duplicate equipment codes found, run 'Renumber Equipment Codes' to enforce unique codes.")
+            return
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX maintenance_equipment_item_code_unique
+                ON maintenance_equipment (item_code)
+             WHERE item_code IS NOT NULL AND item_code != ''
+        """)
 
     @api.model_create_multi
     def create(self, vals_list):
         res = super().create(vals_list)
-        for record in res:
-            if record.category_id and record.category_id.category_code:
-                prefix = record.category_id.category_code
-                count = self.search_count([('category_id', '=', record.category_id.id)])
-                record.item_code = f"{prefix}---{str(count).zfill(4)}"
-            else:
-                record.item_code = ''
+        res._assign_item_codes()
         return res
 
     def write(self, values):
-        res = super().write(values)
+        recategorized = self.browse()
         if 'category_id' in values:
-            prefix = self.category_id.category_code
-            count = self.search_count([('category_id', '=', self.category_id.id)])
-            self.item_code = f"{prefix}---{str(count).zfill(4)}"
-        else:
-            self.item_code = ''
+            # Codes already in use are kept unless the category really changes
+            recategorized = self.filtered(lambda equipment: equipment.category_id.id != values['category_id'])
+        res = super().write(values)
+        recategorized._assign_item_codes()
         return res
 
+    def _assign_item_codes(self):
+        """ Give the equipments a new code from the sequence of their category,
+        allocating the numbers of each category in one query """
+        for category, equipments in self.grouped('category_id').items():
+            if category.category_code:
+                codes = category._next_item_codes(len(equipments))
+            else:
+                codes = [False] * len(equipments)
+            for equipment, code in zip(equipments, codes):
+                super(MaintenanceEquipment, equipment).write({'item_code': code})
+
+    @api.model
+    def _renumber_item_codes(self, batch_size=1000):
+        """ Renumber the code of every equipment per category, in creation order """
+        categories = self.env['maintenance.equipment.category'].search([])
+        for category in categories:
+            category._reset_item_sequence()
+
+        # Clear the codes first so that the unique index never sees a transient duplicate
+        self.flush_model(['item_code'])
+        self.env.cr.execute("UPDATE maintenance_equipment SET item_code = NULL")
+        self.invalidate_model(['item_code'])
+
+        equipment_ids = self.with_context(active_test=False).search([], order='id').ids
+        for ids in split_every(batch_size, equipment_ids):
+            self.browse(ids)._assign_item_codes()
+            self.env.flush_all()
+            self.env.invalidate_all()
+
+        self._create_item_code_index()
+
 
 class MaintenanceInstruction(models.Model):
     _name = 'maintenance.instructions'
+    _inherit = ['maintenance.fulltext.mixin']
     _description = 'Maintenance Instructions'
 
-    name = fields.Char(string="Instruction", required=True)
+    name = fields.Char(string="Instruction", required=True, index='trigram')
     done = fields.Boolean(string="Done")
     not_done = fields.Boolean(string="Not Done")
     equipment_id = fields.Many2one('maintenance.equipment', string="Equipment", ondelete='cascade')
@@ -56,33 +129,43 @@ class MaintenanceInstruction(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         records = super().create(vals_list)
-        for record in records:
-            if record.equipment_id:
-                requests = self.env['maintenance.request.custom'].search(
-                    [('equipment_id', '=', record.equipment_id.id)])
-                for req in requests:
-                    self.env['maintenance.instructions.custom'].create({
-                        'name': record.name,
-                        'done': record.done,
-                        'not_done': record.not_done,
-                        'request_id': req.id,
-                    })
+        templates = records.filtered(lambda r: r.equipment_id and not r.request_id)
+        if templates:
+            templates._propagate_to_custom_requests()
         return records
 
     def write(self, vals):
         res = super().write(vals)
-        for record in self:
-            if record.equipment_id:
-                requests = self.env['maintenance.request.custom'].search(
-                    [('equipment_id', '=', record.equipment_id.id)])
-                for req in requests:
-                    instr = self.env['maintenance.instructions.custom'].search([
-                        ('name', '=', record.name),
-                        ('request_id', '=', req.id)
-                    ], limit=1)
-                    if instr:
-                        instr.write({
-                            'done': record.done,
-                            'not_done': record.not_done
-                        })
+        propagated_vals = {field: vals[field] for field in ('done', 'not_done') if field in vals}
+        if propagated_vals:
+            copies = self._get_custom_request_copies()
+            if copies:
+                copies.write(propagated_vals)
         return res
+
+    @api.model
+    def _propagate_open_requests_only(self):
+        """ Whether checklist changes only reach requests that are not in a done stage """
+        return str2bool(self.env['ir.config_parameter'].sudo().get_param(
+            'maintenance_request_custom.instruction_propagate_open_only', 'False'))
+
+    def _get_custom_request_copies(self):
+        """ Instruction rows copied from these templates onto custom requests """
+        domain = [('template_id', 'in', self.ids)]
+        if self._propagate_open_requests_only():
+            domain += [('request_id.stage_id', 'not in', self.env['maintenance.stage']._get_done_stage_ids())]
+        return self.env['maintenance.instructions.custom'].search(domain)
+
+    def _propagate_to_custom_requests(self):
+        """ Copy new equipment instructions onto the custom requests of their equipment """
+        Request = self.env['maintenance.request.custom']
+        domain = [('equipment_id', 'in', self.equipment_id.ids)]
+        if self._propagate_open_requests_only():
+            domain += [('stage_id', 'not in', self.env['maintenance.stage']._get_done_stage_ids())]
+        requests_by_equipment = Request.search(domain).grouped('equipment_id')
+
+        self.env['maintenance.instructions.custom'].create([
+            Request._prepare_instruction_vals(request, instruction)
+            for instruction in self
+            for request in requests_by_equipment.get(instruction.equipment_id, [])
+        ])
@@ -1,8 +1,59 @@
 from odoo import models, fields, api
+from odoo.tools import SQL
 
 class MaintenanceEquipmentCategory(models.Model):
     _inherit = 'maintenance.equipment.category'
 
 
     short_name = fields.Char(string="Short Name", copy=False, index=True)
-    category_code = fields.Char(string="Category Code", copy=False, index=True)
\ No newline at end of file
+    category_code = fields.Char(string="Category Code", copy=False, index=True)
+    item_sequence_id = fields.Many2one('ir.sequence', string="Equipment Code Sequence", copy=False, readonly=True)
+
+    def _get_item_sequence(self):
+        self.ensure_one()
+        if self.item_sequence_id:
+            return self.item_sequence_id
+
+        # Lock the category so that concurrent creates share a single sequence
+        self.env.cr.execute(SQL(
+            "SELECT item_sequence_id FROM maintenance_equipment_category WHERE id = %s FOR UPDATE",
+            self.id,
+        ))
+        self.invalidate_recordset(['item_sequence_id'])
+        if self.item_sequence_id:
+            return self.item_sequence_id
+
+        # Continue after the highest number in use, the former count-based codes have gaps
+        self.env['maintenance.equipment'].flush_model(['item_code'])
+        self.env.cr.execute(SQL(
+            """
+            SELECT max(substring(item_code FROM '([0-9]+)$')::integer)
+              FROM maintenance_equipment
+             WHERE item_code LIKE %s
+            """,
+            f"{self.category_code}---%",
+        ))
+        last_number = self.env.cr.fetchone()[0] or 0
+        self.sudo().item_sequence_id = self.env['ir.sequence'].sudo().create({
+            'name': f"Equipment Code {self.category_code or self.name}",
+            'implementation': 'standard',
+            'padding': 4,
+            'number_next': last_number + 1,
+            'company_id': False,
+        })
+        return self.item_sequence_id
+
+    def _reset_item_sequence(self):
+        for category in self.filtered('item_sequence_id'):
+            category.item_sequence_id.sudo().number_next = 1
+
+    def _next_item_codes(self, count):
+        """ Allocate ``count`` consecutive equipment codes in a single query """
+        self.ensure_one()
+        sequence = self._get_item_sequence()
+        self.env.cr.execute(SQL(
+            "SELECT nextval(%s) FROM generate_series(1, %s)",
+            f"ir_sequence_{sequence.id:03d}",
+            count,
+        ))
+        return [f"{self.category_code}---{str(number).zfill(4)}" for number, in self.env.cr.fetchall()]
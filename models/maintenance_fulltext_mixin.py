@@ -0,0 +1,115 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.osv import expression
+from odoo.tools import ormcache, SQL
+
+
+class MaintenanceFulltextMixin(models.AbstractModel):
+    """ Ranked full-text search over a text column, backed by one GIN
+    expression index per text search configuration (English and Arabic).
+
+    PostgreSQL maintains the indexes along with the rows, and the ``fulltext``
+    field makes the search available in search views.
+    """
+    _name = 'maintenance.fulltext.mixin'
+    _description = 'Maintenance Full-Text Search'
+
+    _fulltext_configs = ('english', 'arabic')
+    _fulltext_column = 'name'
+
+    fulltext = fields.Char(string="Keyword", compute='_compute_fulltext', search='_search_fulltext')
+
+    def _compute_fulltext(self):
+        self.fulltext = False
+
+    def _search_fulltext(self, operator, value):
+        if operator not in ('ilike', '=', 'not ilike', '!='):
+            raise UserError(_("Operation not supported for a keyword search: %s", operator))
+        negative = operator in ('not ilike', '!=')
+        if not value:
+            return expression.FALSE_DOMAIN if negative else expression.TRUE_DOMAIN
+        if not self._get_fulltext_configs():
+            return [(self._fulltext_column, operator, value)]
+
+        # Kept as a subquery, so that the matching ids are never loaded
+        self.flush_model()
+        matching_ids = SQL(
+            "SELECT id FROM %s WHERE %s",
+            SQL.identifier(self._table),
+            self._fulltext_condition(value),
+        )
+        return [('id', 'not in' if negative else 'in', matching_ids)]
+
+    def init(self):
+        super().init()
+        if self._abstract:
+            return
+        for config in self._get_fulltext_configs():
+            self.env.cr.execute(SQL(
+                "CREATE INDEX IF NOT EXISTS %s ON %s USING gin ((%s))",
+                SQL.identifier(f"{self._table}_fulltext_{config}_idx"),
+                SQL.identifier(self._table),
+                self._fulltext_vector(config),
+            ))
+
+    @api.model
+    @ormcache()
+    def _get_fulltext_configs(self):
+        """ Configurations of _fulltext_configs available in the database """
+        self.env.cr.execute(SQL(
+            "SELECT cfgname FROM pg_ts_config WHERE cfgname IN %s",
+            self._fulltext_configs,
+        ))
+        available = {row[0] for row in self.env.cr.fetchall()}
+        return tuple(config for config in self._fulltext_configs if config in available)
+
+    @api.model
+    def _fulltext_document(self):
+        """ SQL expression of the indexed text of a row """
+        return SQL("coalesce(%s, '')", SQL.identifier(self._fulltext_column))
+
+    @api.model
+    def _fulltext_vector(self, config):
+        return SQL("to_tsvector(%s::regconfig, %s)", config, self._fulltext_document())
+
+    @api.model
+    def _fulltext_condition(self, query):
+        return SQL(" OR ").join(
+            SQL("%s @@ websearch_to_tsquery(%s::regconfig, %s)", self._fulltext_vector(config), config, query)
+            for config in self._get_fulltext_configs()
+        )
+
+    @api.model
+    def _fulltext_rank(self, query):
+        return SQL("GREATEST(%s)", SQL(", ").join(
+            SQL("ts_rank(%s, websearch_to_tsquery(%s::regconfig, %s))", self._fulltext_vector(config), config, query)
+            for config in self._get_fulltext_configs()
+        ))
+
+    @api.model
+    def fulltext_search(self, query, limit=80):
+        """ Ids and names of the records matching the words of ``query``, best
+        ranked first """
+        return [
+            {'id': record.id, 'display_name': record.display_name}
+            for record in self._fulltext_search(query, limit=limit)
+        ]
+
+    @api.model
+    def _fulltext_search(self, query, limit=None):
+        """ Records matching the words of ``query``, best ranked first """
+        if not self._get_fulltext_configs():
+            return self.search([(self._fulltext_column, 'ilike', query)], limit=limit)
+
+        self.flush_model()
+        self.env.cr.execute(SQL(
+            "SELECT id FROM %s WHERE %s ORDER BY %s DESC, id LIMIT %s",
+            SQL.identifier(self._table),
+            self._fulltext_condition(query),
+            self._fulltext_rank(query),
+            limit,
+        ))
+        ranked_ids = [row[0] for row in self.env.cr.fetchall()]
+        # Apply the access rules while keeping the ranking
+        allowed_ids = set(self.search([('id', 'in', ranked_ids)]).ids)
+        return self.browse([record_id for record_id in ranked_ids if record_id in allowed_ids])
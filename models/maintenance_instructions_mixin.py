@@ -0,0 +1,109 @@
+from odoo import models, api
+from odoo.tools import SQL
+
+
+class MaintenanceInstructionsMixin(models.AbstractModel):
+    """ Copies the instruction checklist of the equipment onto requests.
+
+    Inheriting models set ``_instruction_model`` (the model of the copied rows,
+    linked to the request through ``request_id``) and ``_instruction_field``
+    (the one2many holding them on the request).
+    """
+    _name = 'maintenance.instructions.mixin'
+    _description = 'Equipment Instructions Copy'
+
+    _instruction_model = None
+    _instruction_field = None
+
+    @api.model
+    def _get_instruction_sql_threshold(self):
+        """ Number of rows from which copies are inserted with a single
+        INSERT ... SELECT instead of the ORM (0 disables it) """
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'maintenance_request_custom.instruction_sql_threshold', 0))
+
+    def _copy_equipment_instructions(self):
+        """ Create the checklist of the equipment on requests that have none yet """
+        requests = self.filtered('equipment_id')
+        instruction_count = sum(len(request.equipment_id.maintenance_instructions_ids) for request in requests)
+        if not instruction_count:
+            return
+
+        threshold = self._get_instruction_sql_threshold()
+        if threshold and instruction_count >= threshold:
+            requests._copy_equipment_instructions_sql()
+            return
+
+        self.env[self._instruction_model].create([
+            requests._prepare_instruction_vals(request, instruction)
+            for request in requests
+            for instruction in request.equipment_id.maintenance_instructions_ids
+        ])
+
+    def _sync_equipment_instructions(self):
+        """ Replace the checklist of the requests whose copy differs from the
+        one of their (new) equipment, in one unlink and one create """
+        to_unlink = self.env[self._instruction_model]
+        to_copy = self.browse()
+        # Copies must also point to the instructions of the new equipment
+        with_template = 'template_id' in to_unlink._fields
+        for request in self:
+            template = [
+                (instruction.name, instruction.done, instruction.not_done, with_template and instruction.id)
+                for instruction in request.equipment_id.maintenance_instructions_ids
+            ]
+            current = request[self._instruction_field]
+            if template == [
+                (instruction.name, instruction.done, instruction.not_done, with_template and instruction.template_id.id)
+                for instruction in current
+            ]:
+                continue
+            to_unlink |= current
+            to_copy |= request
+
+        to_unlink.unlink()
+        to_copy._copy_equipment_instructions()
+
+    @api.model
+    def _prepare_instruction_vals(self, request, instruction):
+        vals = {
+            'name': instruction.name,
+            'done': instruction.done,
+            'not_done': instruction.not_done,
+            'request_id': request.id,
+        }
+        if 'template_id' in self.env[self._instruction_model]._fields:
+            vals['template_id'] = instruction.id
+        return vals
+
+    def _copy_equipment_instructions_sql(self):
+        instruction_model = self.env[self._instruction_model]
+        self.env['maintenance.instructions'].flush_model(['name', 'done', 'not_done', 'equipment_id'])
+        self.flush_recordset(['equipment_id'])
+
+        columns = SQL("name, done, not_done, request_id, create_uid, create_date, write_uid, write_date")
+        values = SQL("tmpl.name, tmpl.done, tmpl.not_done, req.id, %(uid)s, %(now)s, %(uid)s, %(now)s",
+                     uid=self.env.uid, now=self.env.cr.now())
+        if 'template_id' in instruction_model._fields:
+            columns = SQL("%s, template_id", columns)
+            values = SQL("%s, tmpl.id", values)
+
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO %(table)s (%(columns)s)
+                 SELECT %(values)s
+                   FROM %(request_table)s req
+                   JOIN maintenance_instructions tmpl ON tmpl.equipment_id = req.equipment_id
+                  WHERE req.id IN %(request_ids)s
+               ORDER BY req.id, tmpl.id
+            """,
+            table=SQL.identifier(instruction_model._table),
+            columns=columns,
+            values=values,
+            request_table=SQL.identifier(self._table),
+            request_ids=tuple(self.ids),
+        ))
+        self.invalidate_recordset([self._instruction_field])
+        # Recompute the stored fields depending on the checklist, bypassed by the insert
+        self.modified([self._instruction_field])
+        self.flush_recordset()
@@ -0,0 +1,83 @@
+import base64
+
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+
+class MaintenanceReportCache(models.Model):
+    """ Rendered maintenance order PDFs, keyed on the record and a hash of the
+    values its template prints, so that an unchanged order is not rendered again.
+    """
+    _name = 'maintenance.report.cache'
+    _description = 'Maintenance Report Cache'
+    _order = 'last_used desc, id desc'
+
+    report_name = fields.Char(required=True)
+    res_model = fields.Char(required=True)
+    res_id = fields.Many2oneReference(model_field='res_model', required=True)
+    cache_key = fields.Char(required=True)
+    pdf = fields.Binary(attachment=True, required=True)
+    file_size = fields.Integer()
+    last_used = fields.Datetime(default=fields.Datetime.now, index=True)
+
+    _sql_constraints = [
+        ('report_record_unique', 'unique(report_name, res_model, res_id)',
+         "A report can only be cached once per record."),
+    ]
+
+    @api.model
+    def _get_size_limit(self):
+        """ Maximum size of the cached PDFs, in bytes """
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'maintenance_request_custom.report_cache_size_mb', 500)) * 1024 * 1024
+
+    @api.model
+    def _lookup(self, report_name, res_model, cache_keys):
+        """ Return the cached PDFs of {record id: cache key} in the order of the
+        records, or None when one of them is missing or outdated """
+        entries = self.search([
+            ('report_name', '=', report_name),
+            ('res_model', '=', res_model),
+            ('res_id', 'in', list(cache_keys)),
+        ])
+        entries_by_res_id = {entry.res_id: entry for entry in entries if entry.cache_key == cache_keys[entry.res_id]}
+        if len(entries_by_res_id) != len(cache_keys):
+            return None
+        entries.last_used = fields.Datetime.now()
+        return [base64.b64decode(entries_by_res_id[res_id].pdf) for res_id in cache_keys]
+
+    @api.model
+    def _store(self, report_name, res_model, res_id, cache_key, pdf_content):
+        self.search([
+            ('report_name', '=', report_name),
+            ('res_model', '=', res_model),
+            ('res_id', '=', res_id),
+        ]).unlink()
+        self.create({
+            'report_name': report_name,
+            'res_model': res_model,
+            'res_id': res_id,
+            'cache_key': cache_key,
+            'pdf': base64.b64encode(pdf_content),
+            'file_size': len(pdf_content),
+        })
+        self._evict()
+
+    @api.model
+    def _evict(self):
+        """ Remove the least recently used PDFs beyond the size limit """
+        self.flush_model()
+        self.env.cr.execute(SQL(
+            """
+            SELECT id
+              FROM (
+                    SELECT id, sum(file_size) OVER (ORDER BY last_used DESC, id DESC) AS cumulated_size
+                      FROM maintenance_report_cache
+                   ) entries
+             WHERE cumulated_size > %s
+            """,
+            self._get_size_limit(),
+        ))
+        evicted_ids = [row[0] for row in self.env.cr.fetchall()]
+        if evicted_ids:
+            self.browse(evicted_ids).unlink()
@@ -1,9 +1,13 @@
 from odoo import models, fields, api
-from odoo.osv import expression
+from odoo.tools import ormcache
 
 
 class MaintenanceRequest(models.Model):
-    _inherit = 'maintenance.request'
+    _name = 'maintenance.request'
+    _inherit = ['maintenance.request', 'maintenance.instructions.mixin']
+
+    _instruction_model = 'maintenance.instructions'
+    _instruction_field = 'maintenance_instructions_request_ids'
 
     department_id = fields.Many2one(
         'hr.department',
@@ -13,8 +17,9 @@ class MaintenanceRequest(models.Model):
 
     available_technician_ids = fields.Many2many(
         'hr.employee',
+        'maintenance_request_available_technician_rel',
         compute='_compute_available_technicians',
-        store=False,
+        store=True,
         string='Available Technicians',
         domain="[('company_ids', 'in', company_id)]"
     )
@@ -59,15 +64,7 @@ class MaintenanceRequest(models.Model):
         Automatically fill maintenance_instructions_ids when creating a new maintenance.request.
         """
         records = super().create(vals_list)
-        for record in records:
-            if record.equipment_id:
-                for instruction in record.equipment_id.maintenance_instructions_ids:
-                    self.env['maintenance.instructions'].create({
-                        'name': instruction.name,
-                        'done': instruction.done,
-                        'not_done': instruction.not_done,
-                        'request_id': record.id,
-                    })
+        records._copy_equipment_instructions()
         return records
 
     def write(self, values):
@@ -76,48 +73,16 @@ class MaintenanceRequest(models.Model):
         """
         res = super().write(values)
         if 'equipment_id' in values:
-            for record in self:
-                # Clear existing instructions
-                record.maintenance_instructions_request_ids.unlink()
-                # Copy instructions from the new equipment_id
-                if record.equipment_id:
-                    for instruction in record.equipment_id.maintenance_instructions_ids:
-                        self.env['maintenance.instructions'].create({
-                             'name': instruction.name,
-                        'done': instruction.done,
-                        'not_done': instruction.not_done,
-                        'request_id': record.id,
-                        })
+            self._sync_equipment_instructions()
         return res
 
 
-    @api.model
-    def _search(self, domain, offset=0, limit=None, order=None):
-
-        domain = expression.normalize_domain(domain)
-
-        user = self.env.user
-        # Group that should have full access
-        manager_group = self.env.ref('maintenance_custom.group_maintenance_request_creator', raise_if_not_found=False)
-        # If user is NOT in the manager group, restrict by department
-        if manager_group and manager_group in user.groups_id:
-            department = user.employee_id.department_id
-            print(user.employee_id.name)
-            if department:
-                extra_domain = [('department_id', '=', department.id)]
-                domain = expression.AND([domain, extra_domain])
-            else:
-                # No department assigned, block access to all records
-                domain = expression.AND([domain, [('id', '=', False)]])
-
-        return super(MaintenanceRequest, self)._search(domain, offset=offset, limit=limit, order=order)
-
-    @api.depends('maintenance_team_id')
+    @api.depends('maintenance_team_id', 'maintenance_team_id.member_ids')
     def _compute_available_technicians(self):
         """Compute the available technicians based on the selected team."""
         for record in self:
             if record.maintenance_team_id:
-                record.available_technician_ids = record.maintenance_team_id.member_ids.ids
+                record.available_technician_ids = record.maintenance_team_id._get_member_employee_ids()
             else:
                 record.available_technician_ids = False
 
@@ -162,6 +127,56 @@ class MaintenanceTeam(models.Model):
         string="Team Members",
         domain="[('company_ids', 'in', company_id)]")
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        teams = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return teams
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'member_ids' in vals:
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    @ormcache()
+    def _get_member_index(self):
+        """ Active members of every team, cached on the registry:
+        {team id: (employee ids, user ids, partner ids)}, employees in the
+        order of ``member_ids`` """
+        # Read the pending changes, or the stale values would be cached for the registry
+        self.env['hr.employee'].flush_model(['user_id', 'active', 'name'])
+        self.env['maintenance.team'].flush_model(['member_ids'])
+        self.env.cr.execute("""
+            SELECT rel.maintenance_team_id,
+                   array_agg(employee.id ORDER BY employee.name, employee.id),
+                   array_remove(array_agg(DISTINCT users.id), NULL),
+                   array_remove(array_agg(DISTINCT users.partner_id), NULL)
+              FROM maintenance_team_employees_rel rel
+              JOIN hr_employee employee ON employee.id = rel.hr_employee_id AND employee.active
+         LEFT JOIN res_users users ON users.id = employee.user_id
+          GROUP BY rel.maintenance_team_id
+        """)
+        return {
+            team_id: (tuple(employee_ids), tuple(user_ids), tuple(partner_ids))
+            for team_id, employee_ids, user_ids, partner_ids in self.env.cr.fetchall()
+        }
+
+    def _get_member_employee_ids(self):
+        member_index = self._get_member_index()
+        return list(dict.fromkeys(
+            employee_id for team in self for employee_id in member_index.get(team.id, ((), (), ()))[0]))
+
+    def _get_member_partner_ids(self):
+        member_index = self._get_member_index()
+        return list({partner_id for team in self for partner_id in member_index.get(team.id, ((), (), ()))[2]})
+
 class MaintenanceRequestLine(models.Model):
     _name = "maintenance.request.line"
     _description = "Maintenance Request Line"
@@ -0,0 +1,41 @@
+from odoo import models, fields
+
+
+class MaintenanceInstructionCustomArchive(models.Model):
+    _name = 'maintenance.instructions.custom.archive'
+    _description = 'Archived Maintenance Instructions (Custom Request)'
+    _order = 'request_id, id'
+
+    name = fields.Char(string="Instruction", readonly=True)
+    done = fields.Boolean(string="Done", readonly=True)
+    not_done = fields.Boolean(string="Not Done", readonly=True)
+    request_id = fields.Many2one(
+        'maintenance.request.custom',
+        string="Maintenance Request",
+        readonly=True,
+        index=True,
+        ondelete='cascade'
+    )
+    template_id = fields.Many2one(
+        'maintenance.instructions',
+        string="Equipment Instruction",
+        readonly=True,
+        ondelete='set null'
+    )
+
+
+class MaintenanceTechnicianLineArchive(models.Model):
+    _name = 'maintenance.technician.line.archive'
+    _description = 'Archived Maintenance Technician Line'
+    _order = 'request_id, id'
+
+    request_id = fields.Many2one(
+        'maintenance.request.custom',
+        string="Maintenance Request",
+        readonly=True,
+        index=True,
+        ondelete='cascade'
+    )
+    technician = fields.Many2one('hr.employee', string="Technician", readonly=True)
+    work_hours = fields.Float(string="Working Hours", readonly=True)
+    mc_notes = fields.Text(string="M/C Notes", readonly=True)
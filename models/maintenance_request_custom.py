@@ -1,18 +1,48 @@
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, time
+
 from dateutil.relativedelta import relativedelta
+from markupsafe import Markup
 
 from odoo import models, fields, api, _
 
 from odoo.exceptions import UserError
+from odoo.modules.registry import Registry
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+_logger = logging.getLogger(__name__)
+
+# Fields written on maintenance.request.custom mapped to the
+# (maintenance.request field, maintenance.request.custom source field) they sync
+MIRRORED_FIELDS = {
+    'name': ('name', 'name'),
+    'equipment_id': ('equipment_id', 'equipment_id'),
+    'description': ('description', 'description'),
+    'priority': ('priority', 'priority'),
+    'schedule_date': ('schedule_date', 'scheduled_date'),
+    'duration': ('duration', 'duration'),
+    'department_id': ('department_id', 'department_id'),
+    'maintenance_team_id': ('maintenance_team_id', 'maintenance_team_id'),
+    'maintenance_type': ('maintenance_type', 'maintenance_type'),
+    'machine_temperature': ('machine_temperature', 'machine_temperature'),
+    'work_area_temperature': ('work_area_temperature', 'work_area_temperature'),
+}
 
 
 class MaintenanceRequestCustom(models.Model):
     _name = 'maintenance.request.custom'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'maintenance.instructions.mixin', 'maintenance.fulltext.mixin']
     _description = 'Custom Maintenance Request'
 
+    _instruction_model = 'maintenance.instructions.custom'
+    _instruction_field = 'maintenance_instructions_request_ids_custom'
+
     @api.returns('self')
     def _default_stage(self):
-        return self.env['maintenance.stage'].search([], limit=1)
+        return self.env['maintenance.stage']._get_first_stage()
 
     line_ids = fields.One2many('maintenance.technician.line', 'request_id')
 
@@ -28,7 +58,8 @@ class MaintenanceRequestCustom(models.Model):
     name = fields.Char(string='Request', required=True)
 
     equipment_id = fields.Many2one('maintenance.equipment',
-                                   string="Equipment")
+                                   string="Equipment",
+                                   index='btree_not_null')
 
     category_id = fields.Many2one('maintenance.equipment.category',
                                   string='Category',
@@ -71,9 +102,14 @@ class MaintenanceRequestCustom(models.Model):
         ('text', 'Text')],
         string="Instruction", default="text")
 
-    instruction_pdf = fields.Binary('PDF')
+    instruction_pdf = fields.Binary('PDF', attachment=True)
 
-    archive = fields.Boolean(string='Archived', default=False)
+    active = fields.Boolean(string='Active', default=True)
+
+    history_date = fields.Date(string="Moved to History",
+                               readonly=True,
+                               copy=False,
+                               help="Date the instructions and technician lines of this closed request were moved to the history tables.")
 
     instruction_google_slide = fields.Char('Google Slide',
                                            help="Paste the url of your Google Slide. Make sure the access to the document is public.")
@@ -83,6 +119,7 @@ class MaintenanceRequestCustom(models.Model):
     color = fields.Integer('Color Index')
 
     schedule_date = fields.Datetime('Scheduled Date',
+                                    index=True,
                                     help="Date the maintenance team plans the maintenance.")
 
     company_id = fields.Many2one('res.company',
@@ -92,6 +129,7 @@ class MaintenanceRequestCustom(models.Model):
 
     department_id = fields.Many2one('hr.department',
                                     string="Department",
+                                    index=True,
                                     default=lambda self: self.env.user.employee_id.department_id)
 
     user_id = fields.Many2one('res.users',
@@ -120,6 +158,13 @@ class MaintenanceRequestCustom(models.Model):
         string="Linked Original Request"
     )
 
+    mirror_sync_pending = fields.Boolean(
+        string="Linked Request Sync Pending",
+        copy=False,
+        index=True,
+        help="Set when the linked request still has to be synced by the scheduled action."
+    )
+
     recurring_maintenance = fields.Boolean(string="Recurrent",
                                            compute='_compute_recurring_maintenance',
                                            store=True,
@@ -141,6 +186,17 @@ class MaintenanceRequestCustom(models.Model):
 
     repeat_until = fields.Date(string="Repeat Until")
 
+    recurrence_origin_id = fields.Many2one('maintenance.request.custom',
+                                           string="Recurrence Origin",
+                                           copy=False,
+                                           index='btree_not_null',
+                                           help="First request of the recurring series this request belongs to.")
+
+    recurrence_due = fields.Boolean(string="Recurrence Due",
+                                    copy=False,
+                                    index=True,
+                                    help="Set when the next occurrences of the series still have to be generated.")
+
     owner_user_id = fields.Many2one('res.users',
                                     string='Created by User',
                                     default=lambda s: s.env.uid)
@@ -160,6 +216,25 @@ class MaintenanceRequestCustom(models.Model):
         string="Maintenance Instructions"
     )
 
+    archived_instruction_ids = fields.One2many('maintenance.instructions.custom.archive',
+                                               'request_id',
+                                               string="Archived Instructions")
+
+    archived_line_ids = fields.One2many('maintenance.technician.line.archive',
+                                        'request_id',
+                                        string="Archived Technician Lines")
+
+    work_hours_total = fields.Float(string="Total Working Hours",
+                                    compute='_compute_work_hours_total',
+                                    store=True,
+                                    index=True)
+
+    instruction_progress = fields.Float(string="Instructions Progress",
+                                        compute='_compute_instruction_progress',
+                                        store=True,
+                                        index=True,
+                                        help="Percentage of the instructions marked as done.")
+
     # @api.model_create_multi
     # def create(self, vals_list):
     #     """
@@ -196,6 +271,20 @@ class MaintenanceRequestCustom(models.Model):
     #                     })
     #     return res
 
+    def init(self):
+        super().init()
+        # Partial indexes on the live requests, which are the ones the
+        # instruction fan-out, the record rules and the notifications look up
+        create_index(self.env.cr, 'maintenance_request_custom_active_equipment_idx', self._table,
+                     ['equipment_id', 'stage_id'], where='active AND equipment_id IS NOT NULL')
+        create_index(self.env.cr, 'maintenance_request_custom_active_department_idx', self._table,
+                     ['department_id', 'schedule_date'], where='active')
+
+    @api.model
+    def _fulltext_document(self):
+        # Name and notes, without the HTML tags of the notes
+        return SQL("coalesce(name, '') || ' ' || regexp_replace(coalesce(description, ''), '<[^>]*>', ' ', 'g')")
+
     @api.onchange('equipment_id')
     def _onchange_equipment_id(self):
         for record in self:
@@ -228,7 +317,7 @@ class MaintenanceRequestCustom(models.Model):
     def _get_employee_domain(self):
         domain = []
         if self.maintenance_team_id:
-            domain = [('id', 'in', self.maintenance_team_id.member_ids.ids)]
+            domain = [('id', 'in', self.maintenance_team_id._get_member_employee_ids())]
         return domain
 
     @api.depends('maintenance_team_id', 'equipment_id')
@@ -242,8 +331,8 @@ class MaintenanceRequestCustom(models.Model):
                 record.employee_id = record.equipment_id.category_id.technician_user_id.employee_id
 
             # Fallback to first team member if available
-            elif record.maintenance_team_id and record.maintenance_team_id.member_ids:
-                record.employee_id = record.maintenance_team_id.member_ids[0]
+            elif record.maintenance_team_id._get_member_employee_ids():
+                record.employee_id = record.maintenance_team_id._get_member_employee_ids()[0]
 
             else:
                 record.employee_id = False
@@ -253,6 +342,20 @@ class MaintenanceRequestCustom(models.Model):
         for rec in self:
             rec.user_id = rec.employee_id.user_id.id if rec.employee_id else False
 
+    @api.depends('line_ids.work_hours')
+    def _compute_work_hours_total(self):
+        for request in self:
+            request.work_hours_total = sum(request.line_ids.mapped('work_hours'))
+
+    @api.depends('maintenance_instructions_request_ids_custom.done')
+    def _compute_instruction_progress(self):
+        for request in self:
+            instructions = request.maintenance_instructions_request_ids_custom
+            if instructions:
+                request.instruction_progress = 100.0 * len(instructions.filtered('done')) / len(instructions)
+            else:
+                request.instruction_progress = 0.0
+
     @api.depends('maintenance_type')
     def _compute_recurring_maintenance(self):
         for request in self:
@@ -262,98 +365,87 @@ class MaintenanceRequestCustom(models.Model):
     def archive_equipment_request(self):
         self.write(
             {
-                'archive': True,
+                'active': False,
                 'recurring_maintenance': False
             })
 
     def reset_equipment_request(self):
-        first_stage_obj = self.env['maintenance.stage'].search([], order="sequence asc", limit=1)
-        self.write({'archive': False, 'stage_id': first_stage_obj.id})
-
-    @api.model
-    def create(self, vals):
-        if 'stage_id' not in vals:
-            first_stage = self.env['maintenance.stage'].search([], order='sequence asc', limit=1)
-
-            if first_stage:
-                vals['stage_id'] = first_stage.id
-
-        # Pass close date if stage is done
-        if vals.get('stage_id'):
-            stage = self.env['maintenance.stage'].browse(vals['stage_id'])
-
-        record = super(MaintenanceRequestCustom, self).create(vals)
-
-        for rec in record:
-            if rec.equipment_id:
-                for instruction in record.equipment_id.maintenance_instructions_ids:
-                    self.env['maintenance.instructions.custom'].create({
-                        'name': instruction.name,
-                        'done': instruction.done,
-                        'not_done': instruction.not_done,
-                        'request_id': rec.id,
-                    })
-
-        if record.department_id:
-            record._create_department_activity(record)
-
-        # Prepare values for linked request
-        maintenance_request_vals = {
-            'name': record.name,
-            'equipment_id': record.equipment_id.id,
-            'description': record.description,
-            'request_date': record.request_date,
-            'priority': record.priority,
-            'user_id': record.employee_id.id,
-            'responsible_employee_id': record.employee_id.id if record.employee_id else False,
-            'schedule_date': record.scheduled_date,
-            'duration': record.duration,
-            'department_id': record.department_id.id,
-            'maintenance_type': record.maintenance_type,
-            'maintenance_team_id': record.maintenance_team_id.id,
-            'instruction_type': record.instruction_type,
-            'instruction_pdf': record.instruction_pdf,
-            'repeat_interval': record.repeat_interval,
-            'instruction_google_slide': record.instruction_google_slide,
-            'instruction_text': record.instruction_text,
-            'recurring_maintenance': record.recurring_maintenance,
-            'email_cc': record.email_cc,
-            'machine_temperature': record.machine_temperature,
-            'line_ids': [(0, 0, {
-                'technician': line.technician.id,
-                'work_hours': line.work_hours,
-                'mc_notes': line.mc_notes
-            }) for line in record.line_ids],
-        }
-
-        linked_request = self.env['maintenance.request'].sudo().create(maintenance_request_vals)
-        record.maintenance_request_id = linked_request.id
-
-        # Attach instruction PDF if available
-        if record.instruction_type == 'pdf' and record.instruction_pdf:
-            self.env['ir.attachment'].create({
-                'name': f"{record.name}_instruction.pdf",
-                'type': 'binary',
-                'datas': record.instruction_pdf,
+        first_stage_obj = self.env['maintenance.stage']._get_first_stage()
+        self.write({'active': True, 'stage_id': first_stage_obj.id})
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        first_stage = self.env['maintenance.stage']._get_first_stage()
+        if first_stage:
+            for vals in vals_list:
+                if 'stage_id' not in vals:
+                    vals['stage_id'] = first_stage.id
+
+        records = super(MaintenanceRequestCustom, self).create(vals_list)
+
+        records._copy_equipment_instructions()
+
+        records._notify_department_managers()
+
+        # Create all linked requests in one batch
+        linked_requests = self.env['maintenance.request'].sudo().create(
+            [record._prepare_maintenance_request_vals() for record in records])
+
+        for record, linked_request in zip(records, linked_requests):
+            # Bypass the write override, nothing else needs to be synced here
+            super(MaintenanceRequestCustom, record).write({'maintenance_request_id': linked_request.id})
+
+        # The linked request and its instruction attachment share the stored file of the PDF
+        pdf_attachments = self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_field', '=', 'instruction_pdf'),
+            ('res_id', 'in', records.ids),
+        ])
+        pdf_attachment_by_record = {attachment.res_id: attachment for attachment in pdf_attachments}
+        shared_copies = []
+        for record, linked_request in zip(records, linked_requests):
+            pdf_attachment = pdf_attachment_by_record.get(record.id)
+            if not pdf_attachment:
+                continue
+            shared_copies.append((pdf_attachment, {
+                'name': 'instruction_pdf',
                 'res_model': 'maintenance.request',
+                'res_field': 'instruction_pdf',
                 'res_id': linked_request.id,
-                'mimetype': 'application/pdf'
-            })
+            }))
+            # Attach instruction PDF if available
+            if record.instruction_type == 'pdf':
+                shared_copies.append((pdf_attachment, {
+                    'name': f"{record.name}_instruction.pdf",
+                    'res_model': 'maintenance.request',
+                    'res_id': linked_request.id,
+                    'mimetype': 'application/pdf'
+                }))
+        if shared_copies:
+            self.env['ir.attachment']._create_shared_copies(shared_copies)
 
         # All Links
         base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
-        custom_url = f"{base_url}/web#id={record.id}&model=maintenance.request.custom&view_type=form"
-        request_url = f"{base_url}/web#id={linked_request.id}&model=maintenance.request&view_type=form"
-
-        # Activity in maintenance.request
-        activity_note_maintenance_request = f"""
+        activity_type_id = self.env.ref('mail.mail_activity_data_todo').id
+        request_model_id = self.env['ir.model']._get_id('maintenance.request')
+        custom_model_id = self.env['ir.model']._get_id('maintenance.request.custom')
+        priorities = dict(self._fields['priority'].selection)
+        today = fields.Date.today()
+
+        activity_vals_list = []
+        for record, linked_request in zip(records, linked_requests):
+            custom_url = f"{base_url}/web#id={record.id}&model=maintenance.request.custom&view_type=form"
+            request_url = f"{base_url}/web#id={linked_request.id}&model=maintenance.request&view_type=form"
+
+            # Activity in maintenance.request
+            activity_note_maintenance_request = f"""
                 <p>
                     <strong>{_("A New Maintenance Request Has Been Created. Please Review And Follow Up.")}</strong>
                 </p>
                 <ul>
                     <li><strong>{_("Request Name")}:</strong> {record.name}</li>
                     <li><strong>{_("Equipment")}:</strong> {record.equipment_id.name or 'N/A'}</li>
-                    <li><strong>{_("Priority")}:</strong> {dict(record._fields['priority'].selection).get(record.priority) or ' '}</li>
+                    <li><strong>{_("Priority")}:</strong> {priorities.get(record.priority) or ' '}</li>
                     <li><strong>{_("Scheduled Date")}:</strong> {record.scheduled_date or ' '}</li>
                 </ul>
                 <p>
@@ -362,15 +454,15 @@ class MaintenanceRequestCustom(models.Model):
             </p>
                 </p>
             """
-        # Activity in maintenance.request.custom
-        activity_note_maintenance_request_custom = f"""
+            # Activity in maintenance.request.custom
+            activity_note_maintenance_request_custom = f"""
                         <p>
                             <strong>{_("A New Maintenance Request Has Been Created. Please Review And Follow Up.")}</strong>
                         </p>
                         <ul>
                             <li><strong>{_("Request Name")}:</strong> {record.name}</li>
                             <li><strong>{_("Equipment")}:</strong> {record.equipment_id.name or 'N/A'}</li>
-                            <li><strong>{_("Priority")}:</strong> {dict(record._fields['priority'].selection).get(record.priority) or ' '}</li>
+                            <li><strong>{_("Priority")}:</strong> {priorities.get(record.priority) or ' '}</li>
                             <li><strong>{_("Scheduled Date")}:</strong> {record.scheduled_date or ' '}</li>
                         </ul>
                         <p>
@@ -380,125 +472,109 @@ class MaintenanceRequestCustom(models.Model):
                         </p>
                     """
 
-        self.env['mail.activity'].create({
-            'activity_type_id': self.env.ref('mail.mail_activity_data_todo').id,
-            'summary': _("New Maintenance Request: %s") % record.name,
-            'note': activity_note_maintenance_request,
-            'user_id': record.employee_id.user_id.id if record.employee_id else self.env.uid,
-            'res_id': linked_request.id,
-            'res_model_id': self.env['ir.model']._get_id('maintenance.request'),
-            'date_deadline': fields.Date.today(),
-        })
-
-        self.env['mail.activity'].create({
-            'activity_type_id': self.env.ref('mail.mail_activity_data_todo').id,
-            'summary': _("New Custom Maintenance Request: %s") % record.name,
-            'note': activity_note_maintenance_request_custom,
-            'user_id': record.employee_id.user_id.id if record.employee_id else self.env.uid,
-            'res_id': record.id,
-            'res_model_id': self.env['ir.model']._get_id('maintenance.request.custom'),
-            'date_deadline': fields.Date.today(),
-        })
-        return record
+            user_id = record.employee_id.user_id.id if record.employee_id else self.env.uid
+            activity_vals_list += [{
+                'activity_type_id': activity_type_id,
+                'summary': _("New Maintenance Request: %s") % record.name,
+                'note': activity_note_maintenance_request,
+                'user_id': user_id,
+                'res_id': linked_request.id,
+                'res_model_id': request_model_id,
+                'date_deadline': today,
+            }, {
+                'activity_type_id': activity_type_id,
+                'summary': _("New Custom Maintenance Request: %s") % record.name,
+                'note': activity_note_maintenance_request_custom,
+                'user_id': user_id,
+                'res_id': record.id,
+                'res_model_id': custom_model_id,
+                'date_deadline': today,
+            }]
+
+        if activity_vals_list:
+            self.env['mail.activity'].create(activity_vals_list)
+        return records
+
+    def _prepare_maintenance_request_vals(self):
+        """ Values of the maintenance.request mirrored from this request """
+        self.ensure_one()
+        return {
+            'name': self.name,
+            'equipment_id': self.equipment_id.id,
+            'description': self.description,
+            'request_date': self.request_date,
+            'priority': self.priority,
+            'user_id': self.employee_id.id,
+            'responsible_employee_id': self.employee_id.id if self.employee_id else False,
+            'schedule_date': self.scheduled_date,
+            'duration': self.duration,
+            'department_id': self.department_id.id,
+            'maintenance_type': self.maintenance_type,
+            'maintenance_team_id': self.maintenance_team_id.id,
+            'instruction_type': self.instruction_type,
+            'repeat_interval': self.repeat_interval,
+            'instruction_google_slide': self.instruction_google_slide,
+            'instruction_text': self.instruction_text,
+            'recurring_maintenance': self.recurring_maintenance,
+            'email_cc': self.email_cc,
+            'machine_temperature': self.machine_temperature,
+            'line_ids': [(0, 0, {
+                'technician': line.technician.id,
+                'work_hours': line.work_hours,
+                'mc_notes': line.mc_notes
+            }) for line in self.line_ids],
+        }
 
     def write(self, vals):
-        if vals and 'kanban_state' not in vals and 'stage_id' in vals:
-            vals['kanban_state'] = 'normal'
-
         if 'stage_id' in vals:
-
-            stage = self.env['maintenance.stage'].browse(vals['stage_id'])
-
-            last_stage = self.env['maintenance.stage'].search([], order='sequence desc', limit=1)
-
-            if stage.id == last_stage.id:
-                vals['close_date'] = fields.Date.today()
-
-                activity = self.activity_schedule(
-                    'mail.mail_activity_data_todo',
-                    user_id=self.user_id.id or self.env.uid,
-                    date_deadline=fields.Date.today(),
-                    note="""
-                    <p>{done} {finish}</p>
-                    <p>{archive}</p>
-                    """.format(
-                        done=_("It was completed"),
-                        finish=_("Finish the maintenance request."),
-                        archive=_("Please archive the application or continue with any remaining tasks."),
+            # Derived fields are merged into vals so the whole transition is a single write
+            stage_vals, recurring_requests = self._prepare_stage_transition(vals)
+            vals.update(stage_vals)
+
+            if vals['stage_id'] == self.env['maintenance.stage']._get_last_stage().id:
+                for user_id, requests in self.grouped(lambda r: r.user_id.id or self.env.uid).items():
+                    activity = requests.activity_schedule(
+                        'mail.mail_activity_data_todo',
+                        user_id=user_id,
+                        date_deadline=fields.Date.today(),
+                        note="""
+                        <p>{done} {finish}</p>
+                        <p>{archive}</p>
+                        """.format(
+                            done=_("It was completed"),
+                            finish=_("Finish the maintenance request."),
+                            archive=_("Please archive the application or continue with any remaining tasks."),
+                        )
+                        ,
+
+                        summary=_("🔧 Order status: Expired"),
                     )
-                    ,
+                    activity.action_done()
 
-                    summary=_("🔧 Order status: Expired"),
-                )
-                activity.action_done()
+            if recurring_requests:
+                # The next occurrences are generated by the recurrence scheduled action
+                super(MaintenanceRequestCustom, recurring_requests).write({'recurrence_due': True})
+                self.env.ref('maintenance_request_custom.ir_cron_generate_recurrences')._trigger()
 
-            else:
-                vals['close_date'] = False
-
-            if self.department_id:
-                self._create_department_activity(self)
-
-            for request in self:
-                if stage.done and request.maintenance_type == 'preventive' and request.recurring_maintenance:
-                    schedule_date = request.schedule_date or fields.Datetime.now()
-                    schedule_date += relativedelta(**{f"{request.repeat_unit}s": request.repeat_interval})
-                    if request.repeat_type == 'forever' or schedule_date.date() <= request.repeat_until:
-                        default_stage = self.env['maintenance.stage'].search([], order='sequence asc', limit=1)
-                        request.copy({
-                            'schedule_date': schedule_date,
-                            'stage_id': default_stage.id if default_stage else False
-                        })
+        if self._get_mirror_sync_mode() == 'cron' and any(field in vals for field in MIRRORED_FIELDS):
+            vals['mirror_sync_pending'] = True
+
+        if vals.get('active'):
+            self.filtered('history_date')._restore_from_history()
 
         res = super(MaintenanceRequestCustom, self).write(vals)
         if 'equipment_id' in vals:
-            for record in self:
-                record.maintenance_instructions_request_ids_custom.unlink()
-                if record.equipment_id:
-                    for instruction in record.equipment_id.maintenance_instructions_ids:
-                        self.env['maintenance.instructions.custom'].create({
-                            'name': instruction.name,
-                            'done': instruction.done,
-                            'not_done': instruction.not_done,
-                            'request_id': record.id,
-                        })
-        for record in self:
-            if record.maintenance_request_id:
-                update_vals = {}
-                if 'name' in vals:
-                    update_vals['name'] = record.name
-                if 'equipment_id' in vals:
-                    update_vals['equipment_id'] = record.equipment_id.id
-                if 'description' in vals:
-                    update_vals['description'] = record.description
-                if 'priority' in vals:
-                    update_vals['priority'] = record.priority
-                if 'schedule_date' in vals:
-                    update_vals['schedule_date'] = record.scheduled_date
-                if 'duration' in vals:
-                    update_vals['duration'] = record.duration
-                if 'department_id' in vals:
-                    update_vals['department_id'] = record.department_id.id
-                if 'maintenance_team_id' in vals:
-                    update_vals['maintenance_team_id'] = record.maintenance_team_id.id
-                if 'maintenance_type' in vals:
-                    update_vals['maintenance_type'] = record.maintenance_type
-                if 'machine_temperature' in vals:
-                    update_vals['machine_temperature'] = record.machine_temperature
-                if 'work_area_temperature' in vals:
-                    update_vals['work_area_temperature'] = record.work_area_temperature
-
-                if update_vals:
-                    record.maintenance_request_id.sudo().write(update_vals)
+            self._sync_equipment_instructions()
+        mirrored_fields = [field for field in MIRRORED_FIELDS if field in vals]
+        if mirrored_fields:
+            self._queue_maintenance_request_sync(mirrored_fields)
 
         if vals.get('owner_user_id') or vals.get('employee_id'):
             self._add_followers()
 
         if 'stage_id' in vals:
-            last_stage = self.env['maintenance.stage'].search([], order="sequence desc", limit=1)
-
-            self.filtered(lambda m: vals['stage_id'] == last_stage.id).write({'close_date': fields.Date.today()})
-            self.filtered(lambda m: vals['stage_id'] != last_stage.id).write({'close_date': False})
-
+            # Once written, so that the notifications show the new stage
+            self._notify_department_managers()
             self.activity_feedback(['maintenance.mail_act_maintenance_request'])
             self.activity_update()
 
@@ -511,14 +587,363 @@ class MaintenanceRequestCustom(models.Model):
 
         return res
 
-    def _create_department_activity(self, request):
-        department = request.department_id
-        if not department.manager_id or not department.manager_id.user_id:
+    @api.model
+    def _get_mirror_sync_mode(self):
+        """ How changes are propagated to the linked maintenance.request:
+
+        * ``immediate``: in the same transaction (default)
+        * ``postcommit``: in a new transaction once the current one is committed
+        * ``cron``: by the "Sync Linked Maintenance Requests" scheduled action
+        """
+        return self.env['ir.config_parameter'].sudo().get_param(
+            'maintenance_request_custom.mirror_sync_mode', 'immediate')
+
+    def _queue_maintenance_request_sync(self, field_names):
+        mode = self._get_mirror_sync_mode()
+        if mode == 'cron':
+            # mirror_sync_pending was already written along with the values
+            return
+        if mode != 'postcommit':
+            self._sync_maintenance_requests(field_names)
+            return
+
+        queue = self.env.cr.postcommit.data.get('maintenance.request.custom.mirror_sync')
+        if queue is None:
+            queue = self.env.cr.postcommit.data['maintenance.request.custom.mirror_sync'] = defaultdict(set)
+            dbname, uid, context = self.env.cr.dbname, self.env.uid, self.env.context
+
+            @self.env.cr.postcommit.add
+            def sync_maintenance_requests():
+                try:
+                    with Registry(dbname).cursor() as cr:
+                        env = api.Environment(cr, uid, context)
+                        requests_by_fields = defaultdict(list)
+                        for request_id, request_fields in queue.items():
+                            requests_by_fields[frozenset(request_fields)].append(request_id)
+                        for request_fields, request_ids in requests_by_fields.items():
+                            env['maintenance.request.custom'].browse(request_ids).exists() \
+                                ._sync_maintenance_requests(request_fields)
+                except Exception:
+                    # The requests are committed already, leave the sync to the scheduled action
+                    _logger.exception("Could not sync the linked maintenance requests of %s", list(queue))
+                    with Registry(dbname).cursor() as cr:
+                        env = api.Environment(cr, uid, context)
+                        requests = env['maintenance.request.custom'].browse(list(queue)).exists()
+                        super(MaintenanceRequestCustom, requests).write({'mirror_sync_pending': True})
+                        env.ref('maintenance_request_custom.ir_cron_sync_maintenance_requests')._trigger()
+
+        for request_id in self.ids:
+            queue[request_id].update(field_names)
+
+    def _sync_maintenance_requests(self, field_names):
+        """ Write the given fields on the linked maintenance requests, grouping the
+        linked requests that receive identical values into a single write.
+        """
+        requests_by_vals = defaultdict(lambda: self.env['maintenance.request'])
+        for record in self.filtered('maintenance_request_id'):
+            update_vals = {}
+            for field_name in field_names:
+                target_field, source_field = MIRRORED_FIELDS[field_name]
+                update_vals[target_field] = record._fields[source_field].convert_to_write(record[source_field], record)
+            requests_by_vals[tuple(sorted(update_vals.items()))] |= record.maintenance_request_id
+
+        for update_vals, linked_requests in requests_by_vals.items():
+            linked_requests.sudo().write(dict(update_vals))
+
+    @api.model
+    def _cron_sync_maintenance_requests(self, batch_size=1000):
+        requests = self.search([('mirror_sync_pending', '=', True)], limit=batch_size)
+        requests._sync_maintenance_requests(list(MIRRORED_FIELDS))
+        # Bypass the write override, the flag is not part of any sync
+        super(MaintenanceRequestCustom, requests).write({'mirror_sync_pending': False})
+        if len(requests) == batch_size:
+            self.env['ir.cron']._notify_progress(
+                done=len(requests),
+                remaining=self.search_count([('mirror_sync_pending', '=', True)]))
+
+    def _prepare_stage_transition(self, vals):
+        """ Compute up front every field derived from moving to vals['stage_id'].
+
+        :return: the values to write along with the new stage, and the requests
+                 whose next recurrence must be spawned
+        """
+        stage_model = self.env['maintenance.stage']
+        stage_id = vals['stage_id']
+
+        stage_vals = {
+            'close_date': fields.Date.today() if stage_id == stage_model._get_last_stage().id else False,
+        }
+        if 'kanban_state' not in vals:
+            stage_vals['kanban_state'] = 'normal'
+
+        recurring_requests = self.browse()
+        if stage_id in stage_model._get_done_stage_ids():
+            recurring_requests = self.filtered(
+                lambda r: r.maintenance_type == 'preventive' and r.recurring_maintenance)
+        return stage_vals, recurring_requests
+
+    @api.model
+    def _get_recurrence_horizon(self):
+        """ Number of days ahead for which occurrences of recurring requests are
+        generated (0 only generates the next occurrence) """
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'maintenance_request_custom.recurrence_horizon_days', 0))
+
+    def _get_next_occurrence_dates(self, horizon_end):
+        """ Schedule dates following the one of the request, up to horizon_end and
+        at least the next one, within the repeat limit of the request. Only the
+        next one is returned when it is already overdue, so that late series do
+        not spawn every missed occurrence at once. """
+        self.ensure_one()
+        now = fields.Datetime.now()
+        step = relativedelta(**{f"{self.repeat_unit}s": self.repeat_interval or 1})
+        schedule_date = (self.schedule_date or now) + step
+        occurrence_dates = []
+        while self.repeat_type == 'forever' or (self.repeat_until and schedule_date.date() <= self.repeat_until):
+            occurrence_dates.append(schedule_date)
+            if schedule_date >= horizon_end or schedule_date < now:
+                break
+            schedule_date += step
+        return occurrence_dates
+
+    @api.model
+    def _cron_generate_recurrences(self, batch_size=200):
+        """ Create the upcoming occurrences of the recurring requests marked as due.
+
+        Occurrences already existing in the series are skipped, so that running
+        it again after a failure never creates duplicates.
+        """
+        requests = self.search([('recurrence_due', '=', True)], limit=batch_size)
+        horizon_end = fields.Datetime.now() + relativedelta(days=self._get_recurrence_horizon())
+        first_stage = self.env['maintenance.stage']._get_first_stage()
+
+        series = requests.recurrence_origin_id | requests.filtered(lambda r: not r.recurrence_origin_id)
+        existing_dates = defaultdict(set)
+        for occurrence in self.with_context(active_test=False).search_fetch(
+                ['|', ('id', 'in', series.ids), ('recurrence_origin_id', 'in', series.ids)],
+                ['schedule_date', 'recurrence_origin_id']):
+            existing_dates[(occurrence.recurrence_origin_id or occurrence).id].add(occurrence.schedule_date)
+
+        vals_list = []
+        for request in requests.filtered(lambda r: r.recurring_maintenance):
+            origin = request.recurrence_origin_id or request
+            for schedule_date in request._get_next_occurrence_dates(horizon_end):
+                if schedule_date in existing_dates[origin.id]:
+                    continue
+                existing_dates[origin.id].add(schedule_date)
+                vals_list += request.copy_data({
+                    'schedule_date': schedule_date,
+                    'stage_id': first_stage.id,
+                    'recurrence_origin_id': origin.id,
+                    # The request is copied once closed, the occurrence is not
+                    'close_date': False,
+                    'kanban_state': 'normal',
+                })
+        if vals_list:
+            self.create(vals_list)
+
+        super(MaintenanceRequestCustom, requests).write({'recurrence_due': False})
+        if len(requests) == batch_size:
+            self.env['ir.cron']._notify_progress(
+                done=len(requests),
+                remaining=self.search_count([('recurrence_due', '=', True)]))
+
+    @api.model
+    def _get_history_delay(self):
+        """ Number of months after their closing after which requests are archived
+        and their children moved to the history tables (0 disables it) """
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'maintenance_request_custom.history_delay_months', 12))
+
+    def _cron_move_to_history(self, batch_size=500):
+        """ Archive the requests closed for longer than the history delay and move
+        their instructions and technician lines to the archive tables, so that the
+        live tables only hold current work.
+
+        Rows are moved in SQL, leaving the stored aggregates of the requests as
+        they were when closed.
+        """
+        history_delay = self._get_history_delay()
+        if not history_delay:
+            return
+        domain = [
+            ('history_date', '=', False),
+            ('stage_id', 'in', self.env['maintenance.stage']._get_done_stage_ids()),
+            ('close_date', '<', fields.Date.today() - relativedelta(months=history_delay)),
+        ]
+        requests = self.with_context(active_test=False).search(domain, limit=batch_size)
+        if not requests:
+            return
+
+        self.env['maintenance.instructions.custom'].flush_model()
+        self.env['maintenance.technician.line'].flush_model()
+        self.env.cr.execute(SQL(
+            """
+            WITH moved AS (
+                DELETE FROM maintenance_instructions_custom
+                      WHERE request_id = ANY(%(request_ids)s)
+                  RETURNING name, done, not_done, request_id, template_id
+            )
+            INSERT INTO maintenance_instructions_custom_archive (
+                name, done, not_done, request_id, template_id,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT name, done, not_done, request_id, template_id,
+                   %(uid)s, now() AT TIME ZONE 'UTC', %(uid)s, now() AT TIME ZONE 'UTC'
+              FROM moved
+            """,
+            request_ids=requests.ids,
+            uid=self.env.uid,
+        ))
+        self.env.cr.execute(SQL(
+            """
+            WITH moved AS (
+                DELETE FROM maintenance_technician_line
+                      WHERE request_id = ANY(%(request_ids)s)
+                  RETURNING request_id, technician, work_hours, mc_notes
+            )
+            INSERT INTO maintenance_technician_line_archive (
+                request_id, technician, work_hours, mc_notes,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT request_id, technician, work_hours, mc_notes,
+                   %(uid)s, now() AT TIME ZONE 'UTC', %(uid)s, now() AT TIME ZONE 'UTC'
+              FROM moved
+            """,
+            request_ids=requests.ids,
+            uid=self.env.uid,
+        ))
+        self.env['maintenance.instructions.custom'].invalidate_model()
+        self.env['maintenance.technician.line'].invalidate_model()
+        requests.invalidate_recordset(['maintenance_instructions_request_ids_custom', 'line_ids'])
+
+        super(MaintenanceRequestCustom, requests).write({
+            'active': False,
+            'history_date': fields.Date.today(),
+        })
+        if len(requests) == batch_size:
+            self.env['ir.cron']._notify_progress(
+                done=len(requests),
+                remaining=self.with_context(active_test=False).search_count(domain))
+
+    def _restore_from_history(self):
+        """ Move the archived instructions and technician lines of the requests
+        back to the live tables """
+        self.env.cr.execute(SQL(
+            """
+            WITH restored AS (
+                DELETE FROM maintenance_instructions_custom_archive
+                      WHERE request_id = ANY(%(request_ids)s)
+                  RETURNING name, done, not_done, request_id, template_id
+            )
+            INSERT INTO maintenance_instructions_custom (
+                name, done, not_done, request_id, template_id,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT name, done, not_done, request_id, template_id,
+                   %(uid)s, now() AT TIME ZONE 'UTC', %(uid)s, now() AT TIME ZONE 'UTC'
+              FROM restored
+            """,
+            request_ids=self.ids,
+            uid=self.env.uid,
+        ))
+        self.env.cr.execute(SQL(
+            """
+            WITH restored AS (
+                DELETE FROM maintenance_technician_line_archive
+                      WHERE request_id = ANY(%(request_ids)s)
+                  RETURNING request_id, technician, work_hours, mc_notes
+            )
+            INSERT INTO maintenance_technician_line (
+                request_id, technician, work_hours, mc_notes,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT request_id, technician, work_hours, mc_notes,
+                   %(uid)s, now() AT TIME ZONE 'UTC', %(uid)s, now() AT TIME ZONE 'UTC'
+              FROM restored
+            """,
+            request_ids=self.ids,
+            uid=self.env.uid,
+        ))
+        self.env['maintenance.instructions.custom.archive'].invalidate_model()
+        self.env['maintenance.technician.line.archive'].invalidate_model()
+        self.invalidate_recordset([
+            'maintenance_instructions_request_ids_custom', 'line_ids',
+            'archived_instruction_ids', 'archived_line_ids',
+        ])
+        super(MaintenanceRequestCustom, self).write({'history_date': False})
+
+    @api.model
+    def _get_department_digest_window(self):
+        """ Hours during which the notifications of a manager's departments are
+        collected in the same digest activity (0 creates one activity per request) """
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'maintenance_request_custom.department_digest_window', 24))
+
+    def _notify_department_managers(self):
+        requests = self.filtered(lambda r: r.department_id.manager_id.user_id)
+        if not requests:
+            return
+
+        window = self._get_department_digest_window()
+        if not window:
+            activity_vals_list = []
+            for request in requests:
+                activity_vals_list += request._prepare_department_activity_vals()
+            self.env['mail.activity'].create(activity_vals_list)
             return
 
+        # One digest per manager, whatever the number of departments they manage
+        base_url = self.get_base_url()
+        window_start = fields.Datetime.now() - relativedelta(hours=window)
+        digest_vals_list = []
+        digest_managers = self.env['hr.employee']
+        for manager, manager_requests in requests.grouped(lambda r: r.department_id.manager_id).items():
+            manager_user = manager.user_id
+            lines = Markup().join(request._get_department_digest_line(base_url) for request in manager_requests)
+
+            digest = manager.sudo().maintenance_digest_activity_id
+            if digest.active and digest.user_id == manager_user and digest.create_date >= window_start:
+                digest.note = (digest.note or Markup()) + lines
+                continue
+
+            digest_vals_list.append({
+                'activity_type_id': self.env.ref('mail.mail_activity_data_todo').id,
+                'summary': _("Maintenance Requests of your Departments"),
+                'note': Markup("<p>%s</p>") % _("Maintenance requests of your departments:") + lines,
+                'user_id': manager_user.id,
+                'res_id': manager.id,
+                'res_model_id': self.env['ir.model']._get_id('hr.employee'),
+                'date_deadline': fields.Date.today(),
+            })
+            digest_managers |= manager
+
+        if digest_vals_list:
+            digests = self.env['mail.activity'].create(digest_vals_list)
+            for manager, digest in zip(digest_managers, digests):
+                manager.sudo().maintenance_digest_activity_id = digest
+
+    def _get_department_digest_line(self, base_url):
+        self.ensure_one()
+        request_url = f"{base_url}/web#id={self.id}&model=maintenance.request.custom&view_type=form"
+        return Markup("<p><a href='%s' target='_blank'>%s</a> - %s: %s, %s: %s, %s: %s, %s: %s</p>") % (
+            request_url, self.name,
+            _("Department"), self.department_id.name,
+            _("Equipment"), self.equipment_id.name or _('N/A'),
+            _("Priority"), dict(self._fields['priority'].selection).get(self.priority) or '',
+            _("Stage"), self.stage_id.name or '',
+        )
+
+    def _prepare_department_activity_vals(self):
+        """ Activity values for the department manager of the request, if any """
+        self.ensure_one()
+        department = self.department_id
+        if not department.manager_id or not department.manager_id.user_id:
+            return []
+
         activity_type = self.env.ref('mail.mail_activity_data_todo')
         base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
-        request_url = f"{base_url}/web#id={request.id}&model=maintenance.request.custom&view_type=form"
+        request_url = f"{base_url}/web#id={self.id}&model=maintenance.request.custom&view_type=form"
 
         summary = _("New Maintenance Request for %s") % department.name
         note = (
@@ -529,14 +954,14 @@ class MaintenanceRequestCustom(models.Model):
                    "<p><a href='%s' target='_blank'>%s</a></p>"
                ) % (
                    _("New maintenance request created for your department"),
-                   _("Request"), request.name,
-                   _("Equipment"), request.equipment_id.name or _('N/A'),
-                   _("Priority"), dict(request._fields['priority'].selection).get(request.priority) or '',
+                   _("Request"), self.name,
+                   _("Equipment"), self.equipment_id.name or _('N/A'),
+                   _("Priority"), dict(self._fields['priority'].selection).get(self.priority) or '',
                    request_url,
                    _("View Request")
                )
 
-        self.env['mail.activity'].create({
+        return [{
             'activity_type_id': activity_type.id,
             'summary': summary,
             'note': note,
@@ -544,7 +969,7 @@ class MaintenanceRequestCustom(models.Model):
             'res_id': department.id,
             'res_model_id': self.env['ir.model']._get('hr.department').id,
             'date_deadline': fields.Date.today(),
-        })
+        }]
 
     @api.model
     def _read_group_stage_ids(self, stages, domain):
@@ -553,66 +978,134 @@ class MaintenanceRequestCustom(models.Model):
 
     def activity_update(self):
         """ Update maintenance activities with proper links and details """
-        for request in self:
-            if request.schedule_date:
-                base_url = request.get_base_url()
-                request_url = f"{base_url}/web#id={request.id}&model=maintenance.request.custom&view_type=form"
-
-                activity_vals = {
-                    'activity_type_id': self.env.ref('mail.mail_activity_data_todo').id,
-                    'summary': f'Maintenance Request: {request.name}',
-                    'note': f'Maintenance request created for equipment: {request.equipment_id.name or "N/A"}. '
-                            f'<a href="{request_url}">Open Request</a>',
-                    'user_id': request.employee_id.user_id.id if request.employee_id else request.owner_user_id.id or self.env.uid,
-                    'date_deadline': request.schedule_date.date(),
-                    'res_id': request.id,
-                    'res_model_id': self.env['ir.model']._get_id('maintenance.request.custom'),
-                }
-
-                existing_activity = self.env['mail.activity'].search([
-                    ('res_id', '=', request.id),
-                    ('res_model_id', '=', self.env['ir.model']._get_id('maintenance.request.custom')),
-                    ('activity_type_id', '=', self.env.ref('mail.mail_activity_data_todo').id),
-                ], limit=1)
+        requests = self.filtered('schedule_date')
+        if not requests:
+            return
 
-                if existing_activity:
-                    existing_activity.write(activity_vals)
-                else:
-                    self.env['mail.activity'].create(activity_vals)
+        base_url = self.get_base_url()
+        activity_type_id = self.env.ref('mail.mail_activity_data_todo').id
+        res_model_id = self.env['ir.model']._get_id('maintenance.request.custom')
+
+        existing_activities = {}
+        for activity in self.env['mail.activity'].search([
+            ('res_id', 'in', requests.ids),
+            ('res_model_id', '=', res_model_id),
+            ('activity_type_id', '=', activity_type_id),
+        ]):
+            existing_activities.setdefault(activity.res_id, activity)
+
+        create_vals_list = []
+        activities_by_vals = defaultdict(lambda: self.env['mail.activity'])
+        for request in requests:
+            request_url = f"{base_url}/web#id={request.id}&model=maintenance.request.custom&view_type=form"
+            activity_vals = {
+                'activity_type_id': activity_type_id,
+                'summary': f'Maintenance Request: {request.name}',
+                'note': f'Maintenance request created for equipment: {request.equipment_id.name or "N/A"}. '
+                        f'<a href="{request_url}">Open Request</a>',
+                'user_id': request.employee_id.user_id.id if request.employee_id else request.owner_user_id.id or self.env.uid,
+                'date_deadline': request.schedule_date.date(),
+            }
+
+            existing_activity = existing_activities.get(request.id)
+            if not existing_activity:
+                create_vals_list.append(dict(activity_vals, res_id=request.id, res_model_id=res_model_id))
+                continue
+
+            # Only write what changed, grouping the activities receiving the same values
+            changed_vals = tuple(sorted(
+                (field_name, value) for field_name, value in activity_vals.items()
+                if existing_activity._fields[field_name].convert_to_write(existing_activity[field_name], existing_activity) != value
+            ))
+            if changed_vals:
+                activities_by_vals[changed_vals] |= existing_activity
+
+        for changed_vals, activities in activities_by_vals.items():
+            activities.write(dict(changed_vals))
+        if create_vals_list:
+            self.env['mail.activity'].create(create_vals_list)
 
     def send_notification_to_team(self):
-        for request in self:
-            if request.maintenance_team_id and request.schedule_date:
-                today = fields.Date.today()
-                if request.schedule_date.date() == today:
-                    message = f"""
-                        <p>New maintenance request scheduled for today:</p>
-                        <p><strong>Request:</strong> {request.name}</p>
-                        <p><strong>Equipment:</strong> {request.equipment_id.name or 'N/A'}</p>
-                        <p><strong>Scheduled Date:</strong> {request.schedule_date}</p>
-                        <p><strong>Priority:</strong> {dict(request._fields['priority'].selection).get(request.priority)}</p>
-                    """
-                    request.message_post(
-                        body=message,
-                        subject=f"Maintenance Scheduled: {request.name}",
-                        partner_ids=request.maintenance_team_id.member_ids.mapped('partner_id').ids
-                    )
+        """ Send one summary of the requests scheduled today to each of their teams """
+        today = fields.Date.today()
+        requests = self.filtered(
+            lambda r: r.maintenance_team_id and r.schedule_date and r.schedule_date.date() == today)
+        for team, team_requests in requests.grouped('maintenance_team_id').items():
+            team_requests._notify_team_summary(team)
+
+    def _notify_team_summary(self, team):
+        partner_ids = team._get_member_partner_ids()
+        if not partner_ids:
+            return
+
+        priorities = dict(self._fields['priority'].selection)
+        lines = Markup().join(
+            Markup("<li><strong>%s</strong> - %s: %s, %s: %s, %s: %s</li>") % (
+                request.name,
+                _("Equipment"), request.equipment_id.name or _('N/A'),
+                _("Scheduled Date"), request.schedule_date,
+                _("Priority"), priorities.get(request.priority) or '',
+            )
+            for request in self
+        )
+        self.browse().message_notify(
+            partner_ids=partner_ids,
+            subject=_("Maintenance Scheduled Today: %s") % team.name,
+            body=Markup("<p>%s</p><ul>%s</ul>") % (_("Maintenance requests scheduled for today:"), lines),
+        )
+
+    @api.model
+    def _cron_send_notification_to_team(self):
+        """ Notify the teams of the requests scheduled today.
+
+        The last notified team of the day is kept as a high-water mark, so a run
+        resumed after a failure does not notify the same team twice.
+        """
+        config_parameter = self.env['ir.config_parameter'].sudo()
+        today = fields.Date.today()
+        mark_date, __, mark_team_id = (config_parameter.get_param(
+            'maintenance_request_custom.team_notification_mark') or '').partition(':')
+        last_team_id = int(mark_team_id or 0) if mark_date == str(today) else 0
+
+        day_start = datetime.combine(today, time.min)
+        requests = self.search([
+            ('schedule_date', '>=', day_start),
+            ('schedule_date', '<', day_start + relativedelta(days=1)),
+            ('maintenance_team_id', '>', last_team_id),
+        ])
+
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        for team, team_requests in sorted(requests.grouped('maintenance_team_id').items(), key=lambda item: item[0].id):
+            team_requests._notify_team_summary(team)
+            config_parameter.set_param('maintenance_request_custom.team_notification_mark', f"{today}:{team.id}")
+            if auto_commit:
+                self.env.cr.commit()
 
     def _add_followers(self):
+        """ Subscribe the people involved in the requests, creating all the
+        missing followers of the recordset in a single create """
+        request_ids_by_partners = defaultdict(list)
         for request in self:
-            partner_ids = set()
-            if request.owner_user_id:
-                partner_ids.add(request.owner_user_id.partner_id.id)
-            if request.employee_id and request.employee_id.user_id:
-                partner_ids.add(request.employee_id.user_id.partner_id.id)
-            if request.department_id and request.department_id.manager_id and request.department_id.manager_id.user_id:
-                partner_ids.add(request.department_id.manager_id.user_id.partner_id.id)
-            if request.maintenance_team_id and request.maintenance_team_id.member_ids:
-                for member in request.maintenance_team_id.member_ids:
-                    if member.user_id:
-                        partner_ids.add(member.user_id.partner_id.id)
+            partner_ids = set(request.maintenance_team_id._get_member_partner_ids())
+            partner_ids.update((
+                request.owner_user_id.partner_id
+                | request.employee_id.user_id.partner_id
+                | request.department_id.manager_id.user_id.partner_id
+            ).ids)
             if partner_ids:
-                request.message_subscribe(partner_ids=list(partner_ids))
+                request_ids_by_partners[frozenset(partner_ids)].append(request.id)
+
+        follower_vals_list = []
+        for partner_ids, request_ids in request_ids_by_partners.items():
+            new_followers, __ = self.env['mail.followers']._add_default_followers(
+                self._name, request_ids, list(partner_ids), check_existing=True)
+            follower_vals_list += [
+                dict(values, res_id=res_id)
+                for res_id, values_list in new_followers.items()
+                for values in values_list
+            ]
+        if follower_vals_list:
+            self.env['mail.followers'].sudo().create(follower_vals_list)
 
     def _need_new_activity(self, vals):
         return vals.get('equipment_id')
@@ -635,7 +1128,7 @@ class MaintenanceTechnicianLine(models.Model):
     _name = "maintenance.technician.line"
     _description = "Maintenance Technician Line"
 
-    request_id = fields.Many2one("maintenance.request.custom", string="Maintenance Request")
+    request_id = fields.Many2one("maintenance.request.custom", string="Maintenance Request", index=True)
     technician = fields.Many2one('hr.employee',string="Technician")
     work_hours = fields.Float(string="Working Hours")
     mc_notes = fields.Text(string="M/C Notes")
@@ -643,9 +1136,10 @@ class MaintenanceTechnicianLine(models.Model):
 
 class MaintenanceInstructionCustom(models.Model):
     _name = 'maintenance.instructions.custom'
+    _inherit = ['maintenance.fulltext.mixin']
     _description = 'Maintenance Instructions (Custom Request)'
 
-    name = fields.Char(string="Instruction", required=True)
+    name = fields.Char(string="Instruction", required=True, index='trigram')
     done = fields.Boolean(string="Done")
     not_done = fields.Boolean(string="Not Done")
     request_id = fields.Many2one(
@@ -653,6 +1147,18 @@ class MaintenanceInstructionCustom(models.Model):
         string="Maintenance Request",
         ondelete='cascade'
     )
+    template_id = fields.Many2one(
+        'maintenance.instructions',
+        string="Equipment Instruction",
+        ondelete='set null',
+        index='btree_not_null',
+        help="Instruction of the equipment this row was copied from."
+    )
+
+    def init(self):
+        super().init()
+        create_index(self.env.cr, 'maintenance_instructions_custom_request_id_name_idx', self._table,
+                     ['request_id', 'name'])
 
     @api.constrains('done', 'not_done')
     def _check_instruction_status(self):
@@ -0,0 +1,126 @@
+from odoo import models, fields, api, tools
+from odoo.tools import SQL
+
+
+class MaintenanceRequestCustomKpi(models.Model):
+    """ One precomputed row per custom request, refreshed incrementally by a
+    scheduled action, so that dashboards do not join the request tables live.
+    """
+    _name = 'maintenance.request.custom.kpi'
+    _description = 'Maintenance Request KPI'
+    _auto = False
+    _rec_name = 'request_id'
+    _order = 'request_date desc, id desc'
+
+    request_id = fields.Many2one('maintenance.request.custom', string="Request", readonly=True)
+    equipment_id = fields.Many2one('maintenance.equipment', string="Equipment", readonly=True)
+    category_id = fields.Many2one('maintenance.equipment.category', string="Category", readonly=True)
+    maintenance_team_id = fields.Many2one('maintenance.team', string="Team", readonly=True)
+    department_id = fields.Many2one('hr.department', string="Department", readonly=True)
+    employee_id = fields.Many2one('hr.employee', string="Responsible Employee", readonly=True)
+    stage_id = fields.Many2one('maintenance.stage', string="Stage", readonly=True)
+    company_id = fields.Many2one('res.company', string="Company", readonly=True)
+    maintenance_type = fields.Selection([
+        ('corrective', 'Corrective'),
+        ('preventive', 'Preventive'),
+        ('other_tasks', 'Other tasks'),
+    ], string="Maintenance Type", readonly=True)
+    request_date = fields.Date(string="Request Date", readonly=True)
+    close_date = fields.Date(string="Close Date", readonly=True)
+    work_hours = fields.Float(string="Working Hours", readonly=True)
+    lead_time_days = fields.Float(string="Lead Time (Days)", aggregator='avg', readonly=True,
+                                  help="Days from the request to its closing, for closed requests.")
+    request_count = fields.Integer(string="# Requests", readonly=True)
+    active = fields.Boolean(string="Active", readonly=True,
+                            help="Unset for cancelled requests, which are left out of the KPIs by default. "
+                                 "Requests moved to the history remain active here.")
+
+    def init(self):
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS maintenance_request_custom_kpi (
+                id integer PRIMARY KEY REFERENCES maintenance_request_custom(id) ON DELETE CASCADE,
+                request_id integer,
+                equipment_id integer,
+                category_id integer,
+                maintenance_team_id integer,
+                department_id integer,
+                employee_id integer,
+                stage_id integer,
+                company_id integer,
+                maintenance_type varchar,
+                request_date date,
+                close_date date,
+                work_hours double precision,
+                lead_time_days double precision,
+                request_count integer,
+                active boolean
+            )
+        """)
+        self.env.cr.execute("ALTER TABLE maintenance_request_custom_kpi ADD COLUMN IF NOT EXISTS active boolean")
+        tools.create_index(self.env.cr, 'maintenance_request_custom_kpi_request_date_idx',
+                           self._table, ['request_date'])
+
+    @api.model
+    def _refresh(self, full=False):
+        """ Recompute the rows of the requests changed since the last refresh,
+        or of all the requests when ``full`` is set """
+        config_parameter = self.env['ir.config_parameter'].sudo()
+        last_refresh = config_parameter.get_param('maintenance_request_custom.kpi_refresh_mark')
+        refresh_start = self.env.cr.now()
+
+        self.env['maintenance.request.custom'].flush_model()
+        self.env['maintenance.technician.line'].flush_model()
+        if full or not last_refresh:
+            changed_requests = SQL("SELECT id FROM maintenance_request_custom")
+        else:
+            # write_date is the start of the writing transaction, which may commit
+            # after the previous refresh: look back a while before its mark, the
+            # rows refreshed twice are simply upserted again
+            overlap = int(config_parameter.get_param('maintenance_request_custom.kpi_refresh_overlap_minutes', 60))
+            changed_requests = SQL(
+                """
+                SELECT id FROM maintenance_request_custom WHERE write_date >= %(mark)s
+                 UNION
+                SELECT request_id FROM maintenance_technician_line WHERE write_date >= %(mark)s
+                """,
+                mark=fields.Datetime.subtract(fields.Datetime.to_datetime(last_refresh), minutes=overlap),
+            )
+
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO maintenance_request_custom_kpi (
+                id, request_id, equipment_id, category_id, maintenance_team_id, department_id,
+                employee_id, stage_id, company_id, maintenance_type, request_date, close_date,
+                work_hours, lead_time_days, request_count, active
+            )
+            SELECT req.id, req.id, req.equipment_id, equipment.category_id, req.maintenance_team_id,
+                   req.department_id, req.employee_id, req.stage_id, req.company_id, req.maintenance_type,
+                   req.request_date, req.close_date, COALESCE(req.work_hours_total, 0),
+                   req.close_date - req.request_date, 1,
+                   req.active OR req.history_date IS NOT NULL
+              FROM maintenance_request_custom req
+         LEFT JOIN maintenance_equipment equipment ON equipment.id = req.equipment_id
+             WHERE req.id IN (%(changed_requests)s)
+                ON CONFLICT (id) DO UPDATE SET
+                   equipment_id = EXCLUDED.equipment_id,
+                   category_id = EXCLUDED.category_id,
+                   maintenance_team_id = EXCLUDED.maintenance_team_id,
+                   department_id = EXCLUDED.department_id,
+                   employee_id = EXCLUDED.employee_id,
+                   stage_id = EXCLUDED.stage_id,
+                   company_id = EXCLUDED.company_id,
+                   maintenance_type = EXCLUDED.maintenance_type,
+                   request_date = EXCLUDED.request_date,
+                   close_date = EXCLUDED.close_date,
+                   work_hours = EXCLUDED.work_hours,
+                   lead_time_days = EXCLUDED.lead_time_days,
+                   active = EXCLUDED.active
+            """,
+            changed_requests=changed_requests,
+        ))
+        config_parameter.set_param('maintenance_request_custom.kpi_refresh_mark', fields.Datetime.to_string(refresh_start))
+        self.invalidate_model()
+
+    @api.model
+    def _cron_refresh(self):
+        self._refresh()
@@ -0,0 +1,44 @@
+from odoo import models, api
+from odoo.tools import ormcache
+
+
+class MaintenanceStage(models.Model):
+    _inherit = 'maintenance.stage'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {'sequence', 'done'} & set(vals):
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    @ormcache()
+    def _get_ordered_stage_data(self):
+        """ Ordered tuple of (stage id, done) for all stages, cached on the registry """
+        stages = self.sudo().search_fetch([], ['done'], order='sequence asc, id asc')
+        return tuple((stage.id, stage.done) for stage in stages)
+
+    @api.model
+    def _get_first_stage(self):
+        stage_data = self._get_ordered_stage_data()
+        return self.browse(stage_data[0][0] if stage_data else [])
+
+    @api.model
+    def _get_last_stage(self):
+        stage_data = self._get_ordered_stage_data()
+        return self.browse(stage_data[-1][0] if stage_data else [])
+
+    @api.model
+    def _get_done_stage_ids(self):
+        return [stage_id for stage_id, done in self._get_ordered_stage_data() if done]
@@ -0,0 +1 @@
+from . import maintenance_report
@@ -0,0 +1,137 @@
+import hashlib
+
+from odoo import models, api
+from odoo.tools import split_every
+from odoo.tools.image import image_data_uri
+from odoo.tools.pdf import merge_pdf
+
+MAINTENANCE_REPORTS = (
+    'maintenance_request_custom.report_preventive_maintenance_report_template',
+    'maintenance_request_custom.report_maintenance_report_template',
+)
+
+
+class ReportPreventiveMaintenance(models.AbstractModel):
+    _name = 'report.maintenance_request_custom.report_preventive_maintenance_report_template'
+    _description = 'Preventive Maintenance Report'
+
+    _report_model = 'maintenance.request.custom'
+    _instruction_field = 'maintenance_instructions_request_ids_custom'
+
+    @api.model
+    def _get_report_values(self, docids, data=None):
+        docs = self._prefetch_report_docs(self.env[self._report_model].browse(docids))
+
+        # Encode the logo of each company once instead of once per document
+        company_logos = {
+            company.id: image_data_uri(company.logo)
+            for company in docs.company_id
+            if company.logo
+        }
+        return {
+            'doc_ids': docids,
+            'doc_model': self._report_model,
+            'docs': docs,
+            'company_logos': company_logos,
+        }
+
+    @api.model
+    def _prefetch_report_docs(self, docs):
+        """ Read every record the template walks through once for all the documents """
+        docs.fetch(['name', 'request_date', 'close_date', 'maintenance_type', 'company_id',
+                    'equipment_id', 'department_id', self._instruction_field, 'line_ids'])
+        docs[self._instruction_field].fetch(['name', 'done', 'not_done'])
+        docs.line_ids.fetch(['technician', 'work_hours', 'mc_notes'])
+        docs.line_ids.technician.fetch(['name'])
+        docs.equipment_id.fetch(['name', 'item_code'])
+        docs.department_id.fetch(['name', 'manager_id'])
+        docs.department_id.manager_id.fetch(['name'])
+        return docs
+
+    @api.model
+    def _get_report_cache_keys(self, docs):
+        """ {document id: hash of every value the template prints for it} """
+        docs = self._prefetch_report_docs(docs)
+        report_values = self._get_report_cache_version()
+        cache_keys = {}
+        for doc in docs:
+            printed_values = (
+                report_values,
+                self.env.lang,
+                doc.company_id.id, doc.company_id.write_date,
+                doc.equipment_id.name, doc.equipment_id.item_code,
+                doc.request_date, doc.close_date, doc.maintenance_type,
+                doc.department_id.name, doc.department_id.manager_id.name,
+                [(instruction.name, instruction.done, instruction.not_done)
+                 for instruction in doc[self._instruction_field]],
+                [(line.technician.name, line.work_hours, line.mc_notes) for line in doc.line_ids],
+            )
+            cache_keys[doc.id] = hashlib.sha256(repr(printed_values).encode()).hexdigest()
+        return cache_keys
+
+    @api.model
+    def _get_report_cache_version(self):
+        """ Values identifying the report definition, its template, layout and
+        paper format, so that an upgrade changing them discards the cached PDFs """
+        report_name = self._name.removeprefix('report.')
+        report = self.env['ir.actions.report'].sudo()._get_report_from_name(report_name)
+        company = self.env.company
+        layout_views = self.env['ir.ui.view'].sudo().search([
+            ('key', 'in', [key for key in (report_name, 'web.external_layout', company.external_report_layout_id.key) if key]),
+        ])
+        paperformat = report.paperformat_id or company.paperformat_id
+        return (
+            report.write_date,
+            sorted((view.key, view.write_date) for view in layout_views),
+            paperformat.write_date,
+            company.id, company.name, company.write_date,
+        )
+
+
+class ReportMaintenance(models.AbstractModel):
+    _name = 'report.maintenance_request_custom.report_maintenance_report_template'
+    _inherit = 'report.maintenance_request_custom.report_preventive_maintenance_report_template'
+    _description = 'Maintenance Report'
+
+    _report_model = 'maintenance.request'
+    _instruction_field = 'maintenance_instructions_request_ids'
+
+
+class IrActionsReport(models.Model):
+    _inherit = 'ir.actions.report'
+
+    def _render_qweb_pdf(self, report_ref, res_ids=None, data=None):
+        """ Serve the maintenance orders from the PDF cache when none of their
+        printed values changed, and render large batches by chunks merged
+        afterwards so that printing hundreds of them keeps a bounded memory
+        footprint """
+        report = self._get_report(report_ref)
+        if isinstance(res_ids, int):
+            res_ids = [res_ids]
+        # Options other than the context may change what gets printed
+        if report.report_name not in MAINTENANCE_REPORTS or not res_ids or set(data or ()) - {'context'}:
+            return super()._render_qweb_pdf(report_ref, res_ids=res_ids, data=data)
+
+        docs = self.env[report.model].browse(res_ids)
+        docs.check_access('read')
+        report_cache = self.env['maintenance.report.cache'].sudo()
+        cache_keys = self.env[f'report.{report.report_name}']._get_report_cache_keys(docs)
+        cached_pdfs = report_cache._lookup(report.report_name, report.model, cache_keys)
+        if cached_pdfs:
+            return (cached_pdfs[0] if len(cached_pdfs) == 1 else merge_pdf(cached_pdfs)), 'pdf'
+
+        chunk_size = int(self.env['ir.config_parameter'].sudo().get_param(
+            'maintenance_request_custom.report_chunk_size', 100))
+        if len(res_ids) <= chunk_size:
+            pdf_content, __ = super()._render_qweb_pdf(report_ref, res_ids=res_ids, data=data)
+            if len(res_ids) == 1:
+                report_cache._store(report.report_name, report.model, res_ids[0], cache_keys[res_ids[0]], pdf_content)
+            return pdf_content, 'pdf'
+
+        pdf_contents = []
+        for chunk_ids in split_every(chunk_size, res_ids):
+            pdf_content, __ = super()._render_qweb_pdf(report_ref, res_ids=list(chunk_ids), data=data)
+            pdf_contents.append(pdf_content)
+            # Drop the records of the rendered chunk from the cache
+            self.env.invalidate_all()
+        return merge_pdf(pdf_contents), 'pdf'
@@ -0,0 +1,5 @@
+from . import test_instruction_pdf
+from . import test_stage_transition
+from . import test_security
+from . import test_recurrence
+from . import test_benchmark
@@ -0,0 +1,163 @@
+"""
+SQL query count and wall time of the maintenance request lifecycle operations,
+shared by the benchmark test and the ``tools/benchmark.py`` command line.
+
+Scales are ``<equipment>x<instructions per equipment>x<requests>``. The
+baselines of tests/benchmark_baseline.json are the query counts and wall
+times recorded per scale and operation with ``tools/benchmark.py
+--update-baseline`` on the reference database.
+"""
+import json
+import os
+import time
+
+from odoo import Command
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'benchmark_baseline.json')
+REPORT_REF = 'maintenance_request_custom.report_maintenance_request_custom_report'
+
+OPERATIONS = [
+    'create',
+    'write_equipment',
+    'write_mirrored_field',
+    'instruction_propagation',
+    'write_stage',
+    'render_report_html',
+    'render_report_pdf',
+    'render_report_pdf_cached',
+]
+
+# Operations whose query count must not depend on the number of requests
+BATCHED_OPERATIONS = [
+    'write_equipment',
+    'write_mirrored_field',
+    'instruction_propagation',
+    'write_stage',
+    'render_report_html',
+    'render_report_pdf',
+    'render_report_pdf_cached',
+]
+
+# Accepted wall time increase over the baseline
+DEFAULT_TOLERANCE = 0.25
+
+
+def parse_scale(scale):
+    equipment_count, instruction_count, request_count = (int(part) for part in scale.split('x'))
+    return equipment_count, instruction_count, request_count
+
+
+def load_baselines(path=BASELINE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baselines(baselines, path=BASELINE_FILE):
+    with open(path, 'w') as baseline_file:
+        json.dump(baselines, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write('\n')
+
+
+def seed(env, equipment_count, instruction_count):
+    """ Create the equipment with their instructions, outside of the measures """
+    config_parameter = env['ir.config_parameter'].sudo()
+    config_parameter.set_param('maintenance_request_custom.mirror_sync_mode', 'immediate')
+    team = env['maintenance.team'].create({'name': "Benchmark Team"})
+    equipments = env['maintenance.equipment'].create([{
+        'name': f"Benchmark Equipment {i}",
+        'maintenance_instructions_ids': [
+            Command.create({'name': f"Step {j}"}) for j in range(instruction_count)
+        ],
+    } for i in range(equipment_count)])
+    env.flush_all()
+    return team, equipments
+
+
+def measure(env, operation):
+    """ Query count and wall time of ``operation``, including the flush of its writes """
+    env.flush_all()
+    env.invalidate_all()
+    query_count = env.cr.sql_log_count
+    start = time.perf_counter()
+    operation()
+    env.flush_all()
+    return {
+        'queries': env.cr.sql_log_count - query_count,
+        'time_ms': round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+def run(env, equipment_count, instruction_count, request_count):
+    """ {operation: {'queries': count, 'time_ms': duration}} for a seeded dataset """
+    team, equipments = seed(env, equipment_count, instruction_count)
+    Request = env['maintenance.request.custom']
+    Report = env['ir.actions.report'].with_context(force_report_rendering=True)
+    requests = Request
+
+    def create():
+        nonlocal requests
+        requests = Request.create([{
+            'name': f"Benchmark Request {i}",
+            'equipment_id': equipments[i % len(equipments)].id,
+            'maintenance_team_id': team.id,
+        } for i in range(request_count)])
+
+    def write_equipment():
+        for equipment, equipment_requests in requests.grouped('equipment_id').items():
+            index = equipments.ids.index(equipment.id)
+            equipment_requests.write({'equipment_id': equipments[(index + 1) % len(equipments)].id})
+
+    def write_mirrored_field():
+        requests.write({'priority': '3'})
+
+    def instruction_propagation():
+        equipments.maintenance_instructions_ids.write({'done': True})
+
+    def write_stage():
+        requests.write({'stage_id': env['maintenance.stage']._get_last_stage().id})
+
+    def render_report_html():
+        Report._render_qweb_html(REPORT_REF, requests.ids)
+
+    def render_report_pdf():
+        # Rendered by chunks of a quarter of the requests
+        env['ir.config_parameter'].sudo().set_param(
+            'maintenance_request_custom.report_chunk_size', max(len(requests) // 4, 1))
+        Report._render_qweb_pdf(REPORT_REF, requests.ids)
+
+    def render_report_pdf_cached():
+        Report._render_qweb_pdf(REPORT_REF, requests[:1].ids)
+
+    results = {}
+    for name, operation in [
+        ('create', create),
+        ('write_equipment', write_equipment),
+        ('write_mirrored_field', write_mirrored_field),
+        ('instruction_propagation', instruction_propagation),
+        ('write_stage', write_stage),
+        ('render_report_html', render_report_html),
+        ('render_report_pdf', render_report_pdf),
+    ]:
+        results[name] = measure(env, operation)
+    # The first rendering of a single order fills the cache the measured one is served from
+    Report._render_qweb_pdf(REPORT_REF, requests[:1].ids)
+    results['render_report_pdf_cached'] = measure(env, render_report_pdf_cached)
+    return results
+
+
+def compare(results, baseline, tolerance=None):
+    """ {operation: reason} of the operations exceeding their baseline, or having
+    none; wall times are only compared when a ``tolerance`` is given """
+    regressions = {}
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            regressions[name] = "no baseline"
+        elif result['queries'] > reference['queries']:
+            regressions[name] = f"{result['queries']} queries instead of {reference['queries']}"
+        elif tolerance is not None and reference.get('time_ms') \
+                and result['time_ms'] > reference['time_ms'] * (1 + tolerance):
+            regressions[name] = f"{result['time_ms']} ms instead of {reference['time_ms']} ms"
+    return regressions
@@ -0,0 +1,26 @@
+from odoo import Command
+from odoo.tests import TransactionCase
+
+
+class MaintenanceRequestCustomCommon(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.team = cls.env['maintenance.team'].create({'name': "Test Team"})
+        cls.equipment = cls.env['maintenance.equipment'].create({
+            'name': "Test Equipment",
+            'maintenance_instructions_ids': [
+                Command.create({'name': "Check the oil level"}),
+                Command.create({'name': "Clean the filter"}),
+            ],
+        })
+
+    @classmethod
+    def _create_requests(cls, count, **vals):
+        return cls.env['maintenance.request.custom'].create([dict({
+            'name': f"Test Request {i}",
+            'equipment_id': cls.equipment.id,
+            'maintenance_team_id': cls.team.id,
+        }, **vals) for i in range(count)])
@@ -0,0 +1,50 @@
+import io
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+from odoo.tools.pdf import PdfFileWriter
+
+from odoo.addons.base.models.ir_actions_report import IrActionsReport
+
+from . import benchmark
+
+SCALE = '5x5x20'
+# Same dataset with twice as many requests
+DOUBLE_SCALE = '5x5x40'
+
+
+def _fake_pdf(*args, **kwargs):
+    writer = PdfFileWriter()
+    writer.addBlankPage(width=595, height=842)
+    stream = io.BytesIO()
+    writer.write(stream)
+    return stream.getvalue()
+
+
+@tagged('post_install', '-at_install', 'maintenance_benchmark')
+class TestBenchmark(TransactionCase):
+
+    def _run(self, scale):
+        with patch.object(IrActionsReport, '_run_wkhtmltopdf', _fake_pdf):
+            return benchmark.run(self.env, *benchmark.parse_scale(scale))
+
+    def test_batched_operations_scale(self):
+        # Warm up the caches so that both measured runs start from the same state
+        self._run(SCALE)
+        results = self._run(SCALE)
+        double_results = self._run(DOUBLE_SCALE)
+
+        for name in benchmark.BATCHED_OPERATIONS:
+            with self.subTest(operation=name):
+                self.assertEqual(
+                    double_results[name]['queries'], results[name]['queries'],
+                    "The query count must not grow with the number of requests")
+
+    def test_lifecycle_baseline(self):
+        baseline = benchmark.load_baselines().get(SCALE)
+        if not baseline:
+            self.skipTest(f"No baseline recorded for {SCALE}, run tools/benchmark.py --update-baseline")
+        results = self._run(SCALE)
+
+        self.assertEqual(list(results), benchmark.OPERATIONS)
+        self.assertEqual(benchmark.compare(results, baseline, benchmark.DEFAULT_TOLERANCE), {})
@@ -0,0 +1,30 @@
+import base64
+
+from odoo.tests import tagged
+
+from .common import MaintenanceRequestCustomCommon
+
+PDF_CONTENT = b"%PDF-1.4\n1 0 obj<</Type/Catalog>>endobj\ntrailer<</Root 1 0 R>>\n%%EOF\n"
+
+
+@tagged('post_install', '-at_install')
+class TestInstructionPdf(MaintenanceRequestCustomCommon):
+
+    def test_linked_request_pdf_content(self):
+        request = self._create_requests(
+            1, instruction_type='pdf', instruction_pdf=base64.b64encode(PDF_CONTENT))
+        linked_request = request.maintenance_request_id
+        self.env.invalidate_all()
+
+        self.assertEqual(base64.b64decode(linked_request.instruction_pdf), PDF_CONTENT)
+        attachment = self.env['ir.attachment'].search([
+            ('res_model', '=', 'maintenance.request'),
+            ('res_id', '=', linked_request.id),
+            ('name', '=', f"{request.name}_instruction.pdf"),
+        ])
+        self.assertEqual(attachment.raw, PDF_CONTENT)
+        self.assertEqual(attachment.checksum, request.env['ir.attachment'].search([
+            ('res_model', '=', 'maintenance.request.custom'),
+            ('res_field', '=', 'instruction_pdf'),
+            ('res_id', '=', request.id),
+        ]).checksum)
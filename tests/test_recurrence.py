@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import MaintenanceRequestCustomCommon
+
+
+@tagged('post_install', '-at_install')
+class TestRecurrence(MaintenanceRequestCustomCommon):
+
+    def test_occurrence_of_closed_request_is_open(self):
+        request = self._create_requests(
+            1,
+            maintenance_type='preventive',
+            recurring_maintenance=True,
+            repeat_interval=1,
+            repeat_unit='week',
+            repeat_type='forever',
+            schedule_date=fields.Datetime.now() + timedelta(days=1),
+        )
+        Stage = self.env['maintenance.stage']
+        request.write({'stage_id': Stage._get_last_stage().id, 'kanban_state': 'done'})
+        self.assertEqual(request.close_date, fields.Date.today())
+
+        self.env['maintenance.request.custom']._cron_generate_recurrences()
+
+        occurrence = self.env['maintenance.request.custom'].search([('recurrence_origin_id', '=', request.id)])
+        self.assertEqual(len(occurrence), 1)
+        self.assertEqual(occurrence.schedule_date, request.schedule_date + timedelta(weeks=1))
+        self.assertEqual(occurrence.stage_id, Stage._get_first_stage())
+        self.assertFalse(occurrence.close_date)
+        self.assertEqual(occurrence.kanban_state, 'normal')
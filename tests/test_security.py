@@ -0,0 +1,41 @@
+from odoo.tests import TransactionCase, new_test_user, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestRequestCreatorRule(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.department, cls.other_department = cls.env['hr.department'].create([
+            {'name': "Production"},
+            {'name': "Logistics"},
+        ])
+        cls.creator = new_test_user(
+            cls.env, login='request_creator',
+            groups='base.group_user,maintenance_request_custom.group_maintenance_request_creator')
+        cls.env['hr.employee'].create({
+            'name': "Request Creator",
+            'user_id': cls.creator.id,
+            'department_id': cls.department.id,
+        })
+
+    def test_creator_only_sees_own_department(self):
+        # Both requests are the creator's own, which the maintenance rules allow
+        department_request, other_department_request = self.env['maintenance.request'].create([{
+            'name': "Production Request",
+            'department_id': self.department.id,
+            'owner_user_id': self.creator.id,
+            'user_id': self.creator.id,
+        }, {
+            'name': "Logistics Request",
+            'department_id': self.other_department.id,
+            'owner_user_id': self.creator.id,
+            'user_id': self.creator.id,
+        }])
+
+        visible = self.env['maintenance.request'].with_user(self.creator).search([
+            ('id', 'in', (department_request | other_department_request).ids),
+        ])
+        self.assertEqual(visible, department_request)
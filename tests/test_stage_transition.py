@@ -0,0 +1,51 @@
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import MaintenanceRequestCustomCommon
+
+
+@tagged('post_install', '-at_install')
+class TestStageTransition(MaintenanceRequestCustomCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        stage_data = cls.env['maintenance.stage']._get_ordered_stage_data()
+        cls.middle_stage = cls.env['maintenance.stage'].browse(stage_data[1][0])
+        cls.last_stage = cls.env['maintenance.stage']._get_last_stage()
+
+    def _move(self, requests, stage):
+        """ Move the requests to the stage, returning the number of queries """
+        self.env.flush_all()
+        self.env.invalidate_all()
+
+        Request = type(requests)
+        query_count = self.env.cr.sql_log_count
+        with patch.object(Request, 'write', autospec=True, side_effect=Request.write) as write_mock:
+            requests.write({'stage_id': stage.id})
+            self.env.flush_all()
+        self.assertEqual(write_mock.call_count, 1, "The stage move must not write the requests again")
+        return self.env.cr.sql_log_count - query_count
+
+    def _assert_move_cost_independent_of_size(self, stage):
+        # Warm up the caches with a move of other requests
+        self._move(self._create_requests(2, kanban_state='blocked'), stage)
+
+        requests = self._create_requests(20, kanban_state='blocked')
+        more_requests = self._create_requests(40, kanban_state='blocked')
+        self.assertEqual(
+            self._move(requests, stage), self._move(more_requests, stage),
+            "Moving 40 requests must cost as many queries as moving 20")
+        return requests | more_requests
+
+    def test_move_to_last_stage(self):
+        requests = self._assert_move_cost_independent_of_size(self.last_stage)
+        self.assertEqual(set(requests.mapped('close_date')), {fields.Date.today()})
+        self.assertEqual(set(requests.mapped('kanban_state')), {'normal'})
+
+    def test_move_to_middle_stage(self):
+        requests = self._assert_move_cost_independent_of_size(self.middle_stage)
+        self.assertEqual(set(requests.mapped('close_date')), {False})
+        self.assertEqual(set(requests.mapped('kanban_state')), {'normal'})
@@ -0,0 +1,85 @@
+"""
+Measure the SQL query count and wall time of the maintenance request
+lifecycle operations and compare them against the JSON baseline of the
+benchmark test.
+
+Usage::
+
+    python tools/benchmark.py -c /etc/odoo/odoo.conf -d <database> [--scale 5x5x20]
+        [--baseline tests/benchmark_baseline.json] [--tolerance 0.25]
+        [--output report.json] [--update-baseline]
+
+The scale is ``<equipment>x<instructions per equipment>x<requests>``.
+Everything runs inside a single transaction which is rolled back at the
+end, so the database is left untouched. The module must be installed in
+the database.
+
+The exit status is 1 when an operation has no baseline, runs more queries
+than its baseline, or takes longer than its baseline time increased by the
+tolerance. Run with ``--update-baseline`` on the reference machine to
+record the baselines.
+"""
+import argparse
+import json
+import sys
+
+import odoo
+from odoo import SUPERUSER_ID, api
+from odoo.modules.module import initialize_sys_path
+from odoo.modules.registry import Registry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('-c', '--config', required=True, help="Odoo configuration file")
+    parser.add_argument('-d', '--database', required=True)
+    parser.add_argument('--scale', default='5x5x20',
+                        help="Equipment x instructions per equipment x requests (default: %(default)s)")
+    parser.add_argument('--baseline', help="Baseline file (default: the one of the benchmark test)")
+    parser.add_argument('--tolerance', type=float, default=None,
+                        help="Accepted wall time increase over the baseline (default: 0.25)")
+    parser.add_argument('--output', help="Write the report as JSON to this file")
+    parser.add_argument('--update-baseline', action='store_true', help="Record the results as the baseline")
+    args = parser.parse_args()
+
+    odoo.tools.config.parse_config(['-c', args.config, '-d', args.database])
+    initialize_sys_path()
+    from odoo.addons.maintenance_request_custom.tests import benchmark
+    baseline_file = args.baseline or benchmark.BASELINE_FILE
+    tolerance = benchmark.DEFAULT_TOLERANCE if args.tolerance is None else args.tolerance
+
+    registry = Registry(args.database)
+    with registry.cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        try:
+            results = benchmark.run(env, *benchmark.parse_scale(args.scale))
+        finally:
+            cr.rollback()
+
+    baselines = benchmark.load_baselines(baseline_file)
+    baseline = baselines.get(args.scale, {})
+    regressions = benchmark.compare(results, baseline, tolerance)
+
+    print(f"scale {args.scale}")
+    for name, result in results.items():
+        print(f"  {name:<26} {result['queries']:>7} q {result['time_ms']:>10.1f} ms  {regressions.get(name, '')}")
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump({
+                'scale': args.scale,
+                'results': results,
+                'baseline': baseline,
+                'regressions': regressions,
+            }, output_file, indent=2)
+
+    if args.update_baseline:
+        baselines[args.scale] = results
+        benchmark.save_baselines(baselines, baseline_file)
+        return 0
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Compare the query plans of the maintenance lookups with and without the
+indexes declared by the module.
+
+Usage::
+
+    python tools/index_benchmark.py -c /etc/odoo/odoo.conf -d <database> [--requests 50000] [--json] [--output plans.json]
+
+The dataset is seeded and the indexes are dropped inside a single
+transaction which is rolled back at the end, so the database is left
+untouched. The module must be installed in the database.
+"""
+import argparse
+import json
+
+import odoo
+from odoo import SUPERUSER_ID, api
+from odoo.modules.registry import Registry
+from odoo.tools import SQL
+
+# Indexes declared by the module for the lookups below
+INDEXES = [
+    'maintenance_request_custom__equipment_id_index',
+    'maintenance_request_custom__department_id_index',
+    'maintenance_request_custom_active_equipment_idx',
+    'maintenance_request_custom_active_department_idx',
+    'maintenance_instructions_custom_request_id_name_idx',
+    'mail_activity_res_model_id_res_id_type_idx',
+]
+
+
+def seed(env, request_count):
+    """ Insert ``request_count`` requests with their instructions and to-do activities """
+    team = env['maintenance.team'].search([], limit=1) or env['maintenance.team'].create({'name': "Benchmark"})
+    equipments = env['maintenance.equipment'].create([
+        {'name': f"Benchmark Equipment {i}"} for i in range(200)
+    ])
+    departments = env['hr.department'].create([
+        {'name': f"Benchmark Department {i}"} for i in range(20)
+    ])
+    cr = env.cr
+    cr.execute(SQL("""
+        INSERT INTO maintenance_request_custom
+               (name, equipment_id, department_id, maintenance_team_id, company_id, kanban_state,
+                schedule_date, request_date, active, create_date, write_date)
+        SELECT 'Benchmark ' || n,
+               (%(equipments)s)[1 + n %% %(equipment_count)s],
+               (%(departments)s)[1 + n %% %(department_count)s],
+               %(team)s, %(company)s, 'normal',
+               now() + (n %% 365 - 180) * interval '1 day', current_date,
+               n %% 10 >= 7, now(), now()
+          FROM generate_series(1, %(count)s) n
+     RETURNING id
+    """, equipments=equipments.ids, equipment_count=len(equipments),
+        departments=departments.ids, department_count=len(departments),
+        team=team.id, company=env.company.id, count=request_count))
+    request_ids = [row[0] for row in cr.fetchall()]
+    cr.execute(SQL("""
+        INSERT INTO maintenance_instructions_custom (name, request_id, done, not_done)
+        SELECT 'Step ' || s, r, s %% 2 = 0, false
+          FROM unnest(%(requests)s) r, generate_series(1, 5) s
+    """, requests=request_ids))
+    cr.execute(SQL("""
+        INSERT INTO mail_activity
+               (res_model_id, res_model, res_id, activity_type_id, user_id, date_deadline,
+                active, create_date, write_date)
+        SELECT %(model)s, 'maintenance.request.custom', r, %(type)s, %(user)s, current_date,
+               true, now(), now()
+          FROM unnest(%(requests)s) r
+    """, model=env['ir.model']._get_id('maintenance.request.custom'),
+        type=env.ref('mail.mail_activity_data_todo').id, user=env.uid, requests=request_ids))
+    for table in ('maintenance_request_custom', 'maintenance_instructions_custom', 'mail_activity'):
+        cr.execute(SQL("ANALYZE %s", SQL.identifier(table)))
+    return {
+        'equipment': equipments[0].id,
+        'department': departments[0].id,
+        'requests': request_ids[:50],
+        'model': env['ir.model']._get_id('maintenance.request.custom'),
+        'type': env.ref('mail.mail_activity_data_todo').id,
+    }
+
+
+def get_queries(params):
+    return {
+        'open requests of an equipment': SQL("""
+            SELECT id FROM maintenance_request_custom
+             WHERE equipment_id = %s AND active
+        """, params['equipment']),
+        'upcoming requests of a department': SQL("""
+            SELECT id FROM maintenance_request_custom
+             WHERE department_id = %s AND active AND schedule_date >= now()
+          ORDER BY schedule_date
+        """, params['department']),
+        'to-do activities of requests': SQL("""
+            SELECT id FROM mail_activity
+             WHERE res_model_id = %s AND res_id = ANY(%s) AND activity_type_id = %s
+        """, params['model'], params['requests'], params['type']),
+        'instruction of a request by name': SQL("""
+            SELECT id FROM maintenance_instructions_custom
+             WHERE request_id = %s AND name = 'Step 3'
+        """, params['requests'][0]),
+    }
+
+
+def explain(cr, query):
+    cr.execute(SQL("EXPLAIN (ANALYZE, FORMAT JSON) %s", query))
+    result = cr.fetchone()[0][0]
+    nodes, stack = [], [result['Plan']]
+    while stack:
+        node = stack.pop()
+        nodes.append(node.get('Index Name') or node['Node Type'])
+        stack.extend(node.get('Plans', []))
+    return {'plan': nodes, 'time_ms': result['Execution Time']}
+
+
+def run(env, request_count):
+    params = seed(env, request_count)
+    queries = get_queries(params)
+    report = {name: {'after': explain(env.cr, query)} for name, query in queries.items()}
+    for index in INDEXES:
+        env.cr.execute(SQL("DROP INDEX IF EXISTS %s", SQL.identifier(index)))
+    for name, query in queries.items():
+        report[name]['before'] = explain(env.cr, query)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('-c', '--config', required=True, help="Odoo configuration file")
+    parser.add_argument('-d', '--database', required=True)
+    parser.add_argument('--requests', type=int, default=50000, help="Number of requests to seed")
+    parser.add_argument('--json', action='store_true', help="Print the raw report as JSON")
+    parser.add_argument('--output', help="Write the raw report as JSON to this file")
+    args = parser.parse_args()
+
+    odoo.tools.config.parse_config(['-c', args.config, '-d', args.database])
+    registry = Registry(args.database)
+    with registry.cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        try:
+            report = run(env, args.requests)
+        finally:
+            cr.rollback()
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for name, result in report.items():
+        print(name)
+        for label in ('before', 'after'):
+            print(f"  {label:<6} {result[label]['time_ms']:>9.3f} ms  {' > '.join(result[label]['plan'])}")
+
+
+if __name__ == '__main__':
+    main()